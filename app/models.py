@@ -86,6 +86,13 @@ class DocumentDetail(BaseModel):
     parse_method: Optional[str] = None
 
 
+class DocumentCounts(BaseModel):
+    doc_id: str
+    chunks_count: int = 0
+    definitions_count: int = 0
+    entitlements_count: int = 0
+
+
 class Chunk(BaseModel):
     id: str
     type: str
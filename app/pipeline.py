@@ -186,7 +186,7 @@ def run_docling_or_fallback(src_path: Path, out_dir: Path, options: Optional[dic
 
         doc_loaded = read_json(doc_json) or {}
         chunked = chunk_document(doc_loaded, page_start=page_start, page_end=page_end)
-        write_json(chunks_json, chunked)
+        write_json(chunks_json, chunked, compact=True)
         log["steps"].append(
             {
                 "step": "chunking_ok",
@@ -232,7 +232,7 @@ def run_docling_or_fallback(src_path: Path, out_dir: Path, options: Optional[dic
                     semantic_enrich=semantic_enrich,
                 )
                 if semantic_enrich:
-                    write_json(chunks_json, enriched)
+                    write_json(chunks_json, enriched, compact=True)
                 log["steps"].append(
                     {
                         "step": "indexing_ok",
@@ -309,7 +309,7 @@ def run_chunking_only(processed_dir: Path):
     try:
         doc_loaded = read_json(doc_json) or {}
         chunked = chunk_document(doc_loaded, page_start=page_start, page_end=page_end)
-        write_json(processed_dir / "chunks.json", chunked)
+        write_json(processed_dir / "chunks.json", chunked, compact=True)
         if os.getenv("CHUNK_DEBUG", "").lower() in {"1", "true", "yes"}:
             (processed_dir / "chunk_debug.md").write_text(chunk_debug_markdown(chunked), encoding="utf-8")
         append_log(processed_dir, {"step": "rechunk_ok", "at": now_iso(), "chunks": len(chunked.get("chunks", []))})
@@ -350,7 +350,7 @@ def run_indexing_only(processed_dir: Path):
             semantic_enrich=semantic_enrich,
         )
         if semantic_enrich:
-            write_json(chunks_json, enriched)
+            write_json(chunks_json, enriched, compact=True)
         append_log(processed_dir, {"step": "reindex_ok", "at": now_iso(), "points": indexed})
         meta.update({"status": DocumentStatus.READY, "stage_message": None})
         write_json(meta_path, meta)
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
 import io
+import json
+import mimetypes
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, HTTPException, Request, Response, UploadFile
 from fastapi.responses import FileResponse, StreamingResponse
 
 from config import MAX_UPLOAD_BYTES, PROCESSED_DIR, RAW_DIR
 from models import (
     Chunk,
+    DocumentCounts,
     DocumentDetail,
     DocumentStatus,
     DocumentSummary,
@@ -22,7 +28,9 @@ from preflight import preflight_file
 from search import hybrid_search, keyword_search, semantic_search
 from storage import (
     append_feedback,
+    append_feedback_entries,
     find_raw_path,
+    gzipped_copy,
     now_iso,
     read_json,
     safe_filename,
@@ -34,6 +42,24 @@ from worker import enqueue_task
 
 router = APIRouter()
 
+# doc_id -> (file stamps, counts); recounted only when chunks/extractions change on disk.
+_counts_cache: dict[str, tuple[tuple, DocumentCounts]] = {}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [t.strip() for t in header.split(",")]
+
+
+# Below this size gzip framing costs more than it saves.
+GZIP_MIN_BYTES = 1024
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
 
 @router.get("/health")
 def health():
@@ -218,8 +244,23 @@ def submit_feedback(doc_id: str, feedback: FeedbackItem):
     return {"status": "ok"}
 
 
+@router.post("/documents/{doc_id}/feedback:batch")
+def submit_feedback_batch(doc_id: str, items: List[FeedbackItem]):
+    processed_dir = PROCESSED_DIR / doc_id
+    if not processed_dir.exists():
+        raise HTTPException(status_code=404, detail="Document not found")
+    submitted_at = now_iso()
+    entries = []
+    for item in items:
+        entry = item.dict()
+        entry.update({"doc_id": doc_id, "submitted_at": submitted_at})
+        entries.append(entry)
+    append_feedback_entries(processed_dir, entries)
+    return {"status": "ok", "count": len(entries)}
+
+
 @router.get("/documents/{doc_id}", response_model=DocumentDetail)
-def get_document(doc_id: str):
+def get_document(doc_id: str, request: Request):
     raw_dir = RAW_DIR / doc_id
     processed_dir = PROCESSED_DIR / doc_id
     if not raw_dir.exists() and not processed_dir.exists():
@@ -251,7 +292,7 @@ def get_document(doc_id: str):
         if (processed_dir / name).exists():
             links[name] = f"/documents/{doc_id}/files/{name}"
 
-    return DocumentDetail(
+    detail = DocumentDetail(
         doc_id=doc_id,
         filename=filename,
         display_name=meta.get("display_name"),
@@ -268,6 +309,108 @@ def get_document(doc_id: str):
         parse_method=meta.get("parse_method"),
         links=links or None,
     )
+    body = detail.model_dump_json()
+    etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/documents/{doc_id}/events")
+async def document_events(doc_id: str, request: Request):
+    processed_dir = PROCESSED_DIR / doc_id
+    if not (RAW_DIR / doc_id).exists() and not processed_dir.exists():
+        raise HTTPException(status_code=404, detail="Document not found")
+    meta_path = processed_dir / "meta.json"
+
+    async def stream():
+        last = None
+        idle = 0
+        while not await request.is_disconnected():
+            try:
+                meta = await asyncio.to_thread(read_json, meta_path) or {}
+            except (OSError, ValueError):
+                # meta.json caught mid-rewrite by the pipeline; try again next tick.
+                await asyncio.sleep(1.0)
+                continue
+            snapshot = {
+                "status": meta.get("status", "READY" if processed_dir.exists() else "QUEUED"),
+                "definitions_status": meta.get("definitions_status"),
+                "entitlements_status": meta.get("entitlements_status"),
+                "stage_message": meta.get("stage_message"),
+            }
+            if snapshot != last:
+                last = snapshot
+                idle = 0
+                yield f"data: {json.dumps(snapshot)}\n\n"
+            else:
+                idle += 1
+                if idle % 15 == 0:
+                    # Comment line keeps proxies from closing an idle stream.
+                    yield ": keepalive\n\n"
+            await asyncio.sleep(1.0)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def file_stamp(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@router.get("/documents/{doc_id}/summary", response_model=DocumentCounts)
+def get_document_summary(doc_id: str):
+    processed_dir = PROCESSED_DIR / doc_id
+    if not (RAW_DIR / doc_id).exists() and not processed_dir.exists():
+        raise HTTPException(status_code=404, detail="Document not found")
+    chunks_path = processed_dir / "chunks.json"
+    extractions_path = processed_dir / "extractions.json"
+    stamps = (file_stamp(chunks_path), file_stamp(extractions_path))
+    cached = _counts_cache.get(doc_id)
+    if cached and cached[0] == stamps:
+        return cached[1]
+
+    chunked = read_json(chunks_path) or {}
+    extractions = read_json(extractions_path) or {}
+    entitlements = extractions.get("entitlements") or {}
+    counts = DocumentCounts(
+        doc_id=doc_id,
+        chunks_count=len(chunked.get("chunks") or []),
+        definitions_count=len(extractions.get("definitions") or []),
+        entitlements_count=len(entitlements.get("products") or []),
+    )
+    _counts_cache[doc_id] = (stamps, counts)
+    return counts
+
+
+@router.get("/documents/{doc_id}/extractions/{section}")
+def get_extractions_section(doc_id: str, section: str, request: Request):
+    # Pages only need one branch of extractions.json; sending just that keeps the
+    # other branch off the wire and out of the client's JSON parse.
+    if section not in {"definitions", "entitlements"}:
+        raise HTTPException(status_code=400, detail="section must be definitions or entitlements")
+    path = PROCESSED_DIR / doc_id / "extractions.json"
+    stamp = file_stamp(path)
+    if stamp is None:
+        raise HTTPException(status_code=404, detail="extractions.json not found for this document")
+    etag = f'"{stamp[0]:x}-{stamp[1]:x}-{section}"'
+    gz_etag = etag[:-1] + '-gz"'
+    gzip_ok = accepts_gzip(request)
+    # One file version always yields the same body size, hence the same encoding for a
+    # given Accept-Encoding: either tag the client holds still names what would be sent.
+    for tag in ([gz_etag, etag] if gzip_ok else [etag]):
+        if etag_matches(request, tag):
+            return Response(status_code=304, headers={"ETag": tag, "Vary": "Accept-Encoding"})
+    data = read_json(path) or {}
+    body = json.dumps({section: data.get(section)}, ensure_ascii=False).encode("utf-8")
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MIN_BYTES and gzip_ok:
+        body = gzip.compress(body, compresslevel=6)
+        headers.update({"ETag": gz_etag, "Content-Encoding": "gzip"})
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/documents/{doc_id}/chunks", response_model=List[Chunk])
@@ -381,9 +524,27 @@ def safe_file_path(doc_id: str, name: str) -> Path:
 
 
 @router.get("/documents/{doc_id}/files/{name}")
-def download_processed_file(doc_id: str, name: str):
+def download_processed_file(doc_id: str, name: str, request: Request):
     path = safe_file_path(doc_id, name)
-    return FileResponse(path)
+    stat = path.stat()
+    headers = {"Vary": "Accept-Encoding"}
+    if stat.st_size >= GZIP_MIN_BYTES and accepts_gzip(request):
+        # The gzip variant has its own ETag, so a cache never swaps one encoding for the other.
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-gz"'
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={**headers, "ETag": etag})
+        copy = gzipped_copy(path)
+        if copy is not None:
+            gz_path, (mtime_ns, size) = copy
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            headers.update({"ETag": f'"{mtime_ns:x}-{size:x}-gz"', "Content-Encoding": "gzip"})
+            return FileResponse(gz_path, media_type=media_type, headers=headers)
+        # The file is being rewritten; send it as is rather than a copy of either version.
+        stat = path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    return FileResponse(path, headers={**headers, "ETag": etag})
 
 
 @router.get("/documents/{doc_id}/pages/{page}")
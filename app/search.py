@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import HTTPException
 
 from config import PROCESSED_DIR
+from ipdf.search_utils import keyword_score, make_snippet, section_path_contains
 from models import Evidence, SearchFilter, SearchHit
 from storage import read_json
 
@@ -37,14 +38,6 @@ def chunk_matches_filters(ch: dict, filters: Optional[SearchFilter]) -> bool:
         return False
     if filters.type and ch.get("type") != filters.type:
         return False
-    if filters.section_contains:
-        section_path = ch.get("section_path") or []
-        if isinstance(section_path, list):
-            haystack = " > ".join(section_path)
-        else:
-            haystack = str(section_path)
-        if filters.section_contains.lower() not in haystack.lower():
-            return False
     if filters.page_start or filters.page_end:
         ps = ch.get("page_start")
         pe = ch.get("page_end")
@@ -54,12 +47,13 @@ def chunk_matches_filters(ch: dict, filters: Optional[SearchFilter]) -> bool:
             return False
         if filters.page_end and ps > filters.page_end:
             return False
+    if filters.section_contains:
+        if not section_path_contains(ch.get("section_path"), filters.section_contains):
+            return False
     return True
 
 
 def keyword_search(query: str, filters: Optional[SearchFilter], top_k: int) -> list[SearchHit]:
-    from ipdf.search_utils import keyword_score, make_snippet
-
     scored = []
     for ch in iter_chunks_from_disk(filters):
         if not chunk_matches_filters(ch, filters):
@@ -93,7 +87,6 @@ def keyword_search(query: str, filters: Optional[SearchFilter], top_k: int) -> l
 
 def semantic_search(query: str, filters: Optional[SearchFilter], top_k: int) -> list[SearchHit]:
     from ipdf.embeddings import embed_query
-    from ipdf.search_utils import make_snippet
     from ipdf.vector_store import COLLECTION_NAME, build_filter, get_client, payload_matches_filters
 
     qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
@@ -125,7 +118,7 @@ def semantic_search(query: str, filters: Optional[SearchFilter], top_k: int) ->
         results.append(
             SearchHit(
                 score=float(h.score),
-                snippet=make_snippet(query, payload.get("text", "") or ""),
+                snippet=make_snippet(query, payload.get("text", "") or "", text_lower=payload.get("text_lower")),
                 evidence=Evidence(
                     doc_id=payload.get("doc_id", ""),
                     section_path=section_str or None,
@@ -141,7 +134,6 @@ def semantic_search(query: str, filters: Optional[SearchFilter], top_k: int) ->
 
 
 def hybrid_search(query: str, filters: Optional[SearchFilter], top_k: int) -> list[SearchHit]:
-    from ipdf.search_utils import keyword_score, make_snippet
     from ipdf.embeddings import embed_query
     from ipdf.vector_store import COLLECTION_NAME, build_filter, get_client, payload_matches_filters
 
@@ -173,7 +165,7 @@ def hybrid_search(query: str, filters: Optional[SearchFilter], top_k: int) -> li
         if not payload_matches_filters(payload, filters.model_dump() if filters else None):
             continue
         text = payload.get("text", "") or ""
-        kw = keyword_score(query, text)
+        kw = keyword_score(query, text, text_lower=payload.get("text_lower"))
         sem = float(h.score)
         final = 0.65 * sem + 0.35 * kw
         scored.append((final, payload))
@@ -186,7 +178,7 @@ def hybrid_search(query: str, filters: Optional[SearchFilter], top_k: int) -> li
         results.append(
             SearchHit(
                 score=float(final),
-                snippet=make_snippet(query, payload.get("text", "") or ""),
+                snippet=make_snippet(query, payload.get("text", "") or "", text_lower=payload.get("text_lower")),
                 evidence=Evidence(
                     doc_id=payload.get("doc_id", ""),
                     section_path=section_str or None,
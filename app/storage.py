@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import gzip
 import hashlib
+import os
+import shutil
 import tempfile
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -15,12 +19,16 @@ def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def write_json(path: Path, data: dict) -> None:
+def write_json(path: Path, data: dict, compact: bool = False) -> None:
     import json
 
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        if compact:
+            # No indentation: large artifacts served to the UI stay smaller and parse faster.
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 def read_json(path: Path):
@@ -74,8 +82,39 @@ def find_raw_path(doc_id: str) -> Optional[Path]:
     return sorted(files)[0]
 
 
+# Serializes the read-modify-write of feedback.json across request threads.
+_feedback_lock = threading.Lock()
+
+
 def append_feedback(processed_dir: Path, entry: dict) -> None:
+    append_feedback_entries(processed_dir, [entry])
+
+
+def append_feedback_entries(processed_dir: Path, entries: list[dict]) -> None:
     feedback_path = processed_dir / "feedback.json"
-    feedback = read_json(feedback_path) or {"entries": []}
-    feedback["entries"].append(entry)
-    write_json(feedback_path, feedback)
+    with _feedback_lock:
+        feedback = read_json(feedback_path) or {"entries": []}
+        feedback["entries"].extend(entries)
+        write_json(feedback_path, feedback)
+
+
+def gzipped_copy(path: Path) -> Optional[tuple[Path, tuple[int, int]]]:
+    # Compressed once per source version: the source's (mtime_ns, size) is part of the
+    # copy's name. Returns (copy, stamp), or None if the source changed while compressing.
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    gz_path = path.with_name(f"{path.name}.{stamp[0]:x}-{stamp[1]:x}.gz")
+    if gz_path.exists():
+        return gz_path, stamp
+    tmp_path = gz_path.with_name(f"{gz_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with path.open("rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+    after = path.stat()
+    if (after.st_mtime_ns, after.st_size) != stamp:
+        tmp_path.unlink(missing_ok=True)
+        return None
+    tmp_path.replace(gz_path)
+    for old in path.parent.glob(f"{path.name}.*.gz"):
+        if old != gz_path:
+            old.unlink(missing_ok=True)
+    return gz_path, stamp
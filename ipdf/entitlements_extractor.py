@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import csv
+import mmap
+import os
 import re
 from datetime import datetime, timezone
 from pathlib import Path
@@ -45,6 +47,12 @@ HEADER_MAP = {
 }
 
 
+_HEADER_SUBSTR_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(HEADER_MAP, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
 REF_KEYWORDS = [
     "order form",
     "ordering document",
@@ -55,6 +63,8 @@ REF_KEYWORDS = [
     "order",
 ]
 
+_REF_KEYWORDS_RE = re.compile("|".join(re.escape(k) for k in REF_KEYWORDS), re.IGNORECASE)
+
 
 def _normalize_header(cell: str) -> str:
     c = re.sub(r"\s+", " ", cell.strip().lower())
@@ -80,25 +90,20 @@ def _table_rows_from_chunk(chunk: dict[str, Any]) -> list[list[str]]:
     rows = []
     for line in text.splitlines():
         if "|" in line:
-            parts = [p.strip() for p in line.split("|")]
-            rows.append([p for p in parts if p])
+            cells = [c for c in (p.strip() for p in line.split("|")) if c]
         else:
-            rows.append([line.strip()])
-    return [r for r in rows if any(c for c in r)]
+            stripped = line.strip()
+            cells = [stripped] if stripped else []
+        if cells:
+            rows.append(cells)
+    return rows
 
 
 def _detect_header_row(rows: list[list[str]]) -> tuple[list[str], list[list[str]]]:
     if not rows:
         return [], []
     def header_score(row: list[str]) -> int:
-        score = 0
-        for cell in row:
-            if not cell:
-                continue
-            c = cell.lower()
-            if any(k in c for k in HEADER_MAP.keys()):
-                score += 1
-        return score
+        return sum(1 for cell in row if cell and _HEADER_SUBSTR_RE.search(cell))
 
     if len(rows) >= 1 and header_score(rows[0]) >= 2:
         return rows[0], rows[1:]
@@ -123,13 +128,12 @@ def _classify_table(headers: list[str]) -> str:
 def _normalize_rows(headers: list[str], rows: list[list[str]]) -> list[dict[str, str]]:
     norm_headers = [_normalize_header(h) for h in headers]
     normalized = []
+    width = len(norm_headers)
     for row in rows:
-        row_cells = row + [""] * (len(norm_headers) - len(row))
-        item = {}
-        for idx, cell in enumerate(row_cells[: len(norm_headers)]):
-            key = norm_headers[idx]
-            item[key] = cell.strip()
-        if any(v for v in item.values()):
+        pad = width - len(row)
+        cells = row + [""] * pad if pad > 0 else row
+        item = {k: v.strip() for k, v in zip(norm_headers, cells)}
+        if any(item.values()):
             normalized.append(item)
     return normalized
 
@@ -230,8 +234,7 @@ def extract_entitlements(chunked: dict[str, Any]) -> dict[str, Any]:
     # References if no entitlements found
     if not products:
         for ch in chunks:
-            text = (ch.get("text") or "").lower()
-            if any(k in text for k in REF_KEYWORDS):
+            if _REF_KEYWORDS_RE.search(ch.get("text") or ""):
                 references.append(
                     {
                         "ref_type": "ordering_document",
@@ -268,20 +271,19 @@ def write_entitlements_csv(path: Path, doc_id: str, products: list[dict[str, Any
     with path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["doc_id", "product_name", "metric", "quantity", "unit", "term", "restrictions", "page_start"])
-        for p in products:
-            ev = (p.get("evidence") or [{}])[0]
-            writer.writerow(
-                [
-                    doc_id,
-                    p.get("name"),
-                    p.get("metric"),
-                    p.get("quantity"),
-                    p.get("unit"),
-                    p.get("term"),
-                    "; ".join(p.get("restrictions") or []),
-                    ev.get("page_start"),
-                ]
+        writer.writerows(
+            (
+                doc_id,
+                p.get("name"),
+                p.get("metric"),
+                p.get("quantity"),
+                p.get("unit"),
+                p.get("term"),
+                "; ".join(p.get("restrictions") or []),
+                (p.get("evidence") or [{}])[0].get("page_start"),
             )
+            for p in products
+        )
 
 
 def update_review_pack(path: Path, entitlements: dict[str, Any]) -> None:
@@ -320,15 +322,22 @@ def update_review_pack(path: Path, entitlements: dict[str, Any]) -> None:
         path.write_text("# Review Pack\n\n" + section, encoding="utf-8")
         return
 
-    content = path.read_text(encoding="utf-8")
-    if header in content:
-        before, rest = content.split(header, 1)
-        next_idx = rest.find("\n## ")
-        if next_idx != -1:
-            after = rest[next_idx + 1 :]
-            content = before + section + "\n" + after
+    section_bytes = section.encode("utf-8")
+    header_bytes = header.encode("utf-8")
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            parts = [b"\n\n", section_bytes]
         else:
-            content = before + section
-    else:
-        content = content.rstrip() + "\n\n" + section
-    path.write_text(content, encoding="utf-8")
+            # Locate the section by byte offset and splice it without decoding the whole pack.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = mm.find(header_bytes)
+                if start != -1:
+                    next_idx = mm.find(b"\n## ", start + len(header_bytes))
+                    if next_idx != -1:
+                        parts = [mm[:start], section_bytes, b"\n", mm[next_idx + 1 :]]
+                    else:
+                        parts = [mm[:start], section_bytes]
+                else:
+                    parts = [mm[:].rstrip(), b"\n\n", section_bytes]
+    path.write_bytes(b"".join(parts))
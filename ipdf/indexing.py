@@ -1,54 +1,36 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Iterable
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
 
 import uuid
 
-from qdrant_client.models import FieldCondition, Filter, MatchValue, PointStruct
+from qdrant_client.models import FieldCondition, Filter, HasIdCondition, MatchValue, PointStruct
 
 from .embeddings import embed_texts
 from .vector_store import COLLECTION_NAME, ensure_collection, get_client
 
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
 
-def index_chunks(
-    chunked: dict[str, Any],
-    qdrant_url: str,
-    embedding_model: str,
-    semantic_enrich: bool = False,
-) -> tuple[int, dict[str, Any]]:
-    chunks = chunked.get("chunks") or []
-    if not chunks:
-        return 0
-
-    texts = [c.get("text", "") or "" for c in chunks]
-    embeddings = embed_texts(texts, embedding_model)
-    if not embeddings:
-        return 0
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "256"))
+INDEX_WORKERS = 4
 
-    vector_size = len(embeddings[0])
-    client = get_client(qdrant_url)
-    ensure_collection(client, vector_size)
-
-    doc_id = chunked.get("doc_id")
-    if doc_id:
-        client.delete(
-            collection_name=COLLECTION_NAME,
-            points_selector=Filter(must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_id))]),
-        )
-
-    semantic_labels = None
-    if semantic_enrich:
-        from .semantic_enrich import infer_semantic_labels
-
-        semantic_labels = infer_semantic_labels(embeddings, embedding_model)
 
+def _build_points(
+    doc_id: Any,
+    chunks: list[dict[str, Any]],
+    embeddings: list[list[float]],
+    embedding_model: str,
+    vector_size: int,
+    semantic_labels: Optional[list[dict[str, Any]]] = None,
+) -> list[PointStruct]:
+    base_payload = {"doc_id": doc_id, "embedding_model": embedding_model, "embedding_dim": vector_size}
     points = []
     for idx, ch in enumerate(chunks):
         chunk_id = ch.get("chunk_id")
-        try:
-            uuid.UUID(str(chunk_id))
-        except Exception:
+        if not _UUID_RE.fullmatch(str(chunk_id)):
             # Ensure Qdrant-compatible UUIDs even for legacy chunks.
             base = "|".join([str(doc_id)] + (ch.get("source_blocks") or []) + [ch.get("text", "") or ""])
             chunk_id = str(uuid.uuid5(uuid.NAMESPACE_URL, base))
@@ -56,21 +38,83 @@ def index_chunks(
         if semantic_labels:
             ch["semantic_type"] = semantic_labels[idx]["semantic_type"]
             ch["semantic_confidence"] = semantic_labels[idx]["semantic_confidence"]
-        payload = {
-            "doc_id": chunked.get("doc_id"),
+        text = ch.get("text")
+        payload = base_payload | {
             "type": ch.get("type"),
             "section_path": ch.get("section_path"),
             "clause_ref": ch.get("clause_ref"),
             "page_start": ch.get("page_start"),
             "page_end": ch.get("page_end"),
-            "text": ch.get("text"),
+            "text": text,
+            "text_lower": (text or "").lower(),
             "heading": ch.get("heading"),
-            "embedding_model": embedding_model,
-            "embedding_dim": vector_size,
             "semantic_type": ch.get("semantic_type"),
             "semantic_confidence": ch.get("semantic_confidence"),
         }
         points.append(PointStruct(id=chunk_id, vector=embeddings[idx], payload=payload))
+    return points
+
 
-    client.upsert(collection_name=COLLECTION_NAME, points=points)
-    return len(points), chunked
+def index_chunks(
+    chunked: dict[str, Any],
+    qdrant_url: str,
+    embedding_model: str,
+    semantic_enrich: bool = False,
+) -> tuple[int, dict[str, Any]]:
+    chunks = chunked.get("chunks") or []
+    if not chunks:
+        return 0, chunked
+
+    doc_id = chunked.get("doc_id")
+    batches = [chunks[i : i + INDEX_BATCH_SIZE] for i in range(0, len(chunks), INDEX_BATCH_SIZE)]
+
+    def embed_batch(batch: list[dict[str, Any]]) -> list[list[float]]:
+        return embed_texts([c.get("text", "") or "" for c in batch], embedding_model)
+
+    infer_semantic_labels = None
+    if semantic_enrich:
+        from .semantic_enrich import infer_semantic_labels
+
+    client = None
+    vector_size = 0
+    upserts = []
+    new_ids: list[str] = []
+    # Embed batch N+1 while batch N is being upserted; batches are independent.
+    with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as pool:
+        next_embed = pool.submit(embed_batch, batches[0])
+        for i, batch in enumerate(batches):
+            embeddings = next_embed.result()
+            if i + 1 < len(batches):
+                next_embed = pool.submit(embed_batch, batches[i + 1])
+
+            if client is None:
+                if not embeddings:
+                    return 0, chunked
+                vector_size = len(embeddings[0])
+                client = get_client(qdrant_url)
+                ensure_collection(client, vector_size)
+
+            semantic_labels = None
+            if infer_semantic_labels:
+                semantic_labels = infer_semantic_labels(embeddings, embedding_model)
+
+            points = _build_points(doc_id, batch, embeddings, embedding_model, vector_size, semantic_labels)
+            new_ids.extend(p.id for p in points)
+            upserts.append((len(points), pool.submit(client.upsert, collection_name=COLLECTION_NAME, points=points)))
+
+        indexed = 0
+        for count, future in upserts:
+            future.result()
+            indexed += count
+
+    # Only once every batch is embedded and upserted: drop the doc's points that the
+    # new chunking no longer produces. A failure above leaves the old index intact.
+    if doc_id:
+        client.delete(
+            collection_name=COLLECTION_NAME,
+            points_selector=Filter(
+                must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_id))],
+                must_not=[HasIdCondition(has_id=new_ids)],
+            ),
+        )
+    return indexed, chunked
@@ -1,34 +1,42 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from functools import lru_cache
+from typing import Any, Iterable, Optional
 
 
-def _tokenize(text: str) -> list[str]:
-    return re.findall(r"[a-zA-Z0-9']+", text.lower())
+_TOKEN_RE = re.compile(r"[a-zA-Z0-9']+")
 
 
-def keyword_score(query: str, text: str) -> float:
+def _tokenize(text: str, lowered: bool = False) -> list[str]:
+    return _TOKEN_RE.findall(text if lowered else text.lower())
+
+
+@lru_cache(maxsize=128)
+def _query_token_set(query: str) -> frozenset[str]:
+    # The same query is scored against every candidate in a ranking loop.
+    return frozenset(_tokenize(query))
+
+
+def keyword_score(query: str, text: str, text_lower: Optional[str] = None) -> float:
     if not query or not text:
         return 0.0
-    q_tokens = _tokenize(query)
-    if not q_tokens:
+    q_set = _query_token_set(query)
+    if not q_set:
         return 0.0
-    t_tokens = _tokenize(text)
-    if not t_tokens:
+    t_set = set(_tokenize(text_lower, lowered=True) if text_lower is not None else _tokenize(text))
+    if not t_set:
         return 0.0
-    t_set = set(t_tokens)
-    hits = sum(1 for t in q_tokens if t in t_set)
-    return hits / max(len(set(q_tokens)), 1)
+    return len(q_set & t_set) / len(q_set)
 
 
-def make_snippet(query: str, text: str, max_len: int = 300) -> str:
+def make_snippet(query: str, text: str, max_len: int = 300, text_lower: Optional[str] = None) -> str:
     if not text:
         return ""
     if not query:
         return text[:max_len] + ("…" if len(text) > max_len else "")
     q = query.strip()
-    idx = text.lower().find(q.lower())
+    idx = (text_lower if text_lower is not None else text.lower()).find(q.lower())
     if idx == -1:
         return text[:max_len] + ("…" if len(text) > max_len else "")
     start = max(idx - 80, 0)
@@ -39,3 +47,13 @@ def make_snippet(query: str, text: str, max_len: int = 300) -> str:
     if end < len(text):
         snippet = snippet + "…"
     return snippet
+
+
+def section_path_contains(section_path: Any, needle: str) -> bool:
+    needle = needle.lower()
+    if isinstance(section_path, list):
+        # Only a needle that can span the " > " separator needs the joined path.
+        if ">" in needle or needle != needle.strip():
+            return needle in " > ".join(section_path).lower()
+        return any(needle in str(s).lower() for s in section_path)
+    return needle in str(section_path or "").lower()
@@ -14,6 +14,8 @@ from qdrant_client.models import (
     VectorParams,
 )
 
+from .search_utils import section_path_contains
+
 
 COLLECTION_NAME = os.getenv("QDRANT_COLLECTION", "contract_chunks_v1")
 
@@ -94,16 +96,6 @@ def payload_matches_filters(payload: dict[str, Any], filters: Optional[dict[str,
     if filters.get("type") and payload.get("type") != filters.get("type"):
         return False
 
-    section_contains = filters.get("section_contains")
-    if section_contains:
-        section_path = payload.get("section_path") or []
-        if isinstance(section_path, list):
-            haystack = " > ".join(section_path)
-        else:
-            haystack = str(section_path)
-        if section_contains.lower() not in haystack.lower():
-            return False
-
     page_start = filters.get("page_start")
     page_end = filters.get("page_end")
     if page_start or page_end:
@@ -116,4 +108,8 @@ def payload_matches_filters(payload: dict[str, Any], filters: Optional[dict[str,
         if page_end and ps > page_end:
             return False
 
+    section_contains = filters.get("section_contains")
+    if section_contains and not section_path_contains(payload.get("section_path"), section_contains):
+        return False
+
     return True
@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+try:
+    from ipdf import indexing
+except ImportError:  # qdrant-client / embedding deps not installed
+    indexing = None
+
+
+@unittest.skipIf(indexing is None, "ipdf indexing dependencies not installed")
+class IndexChunksFailureTest(unittest.TestCase):
+    def test_embedding_failure_leaves_existing_points(self):
+        chunks = [{"chunk_id": f"c{i}", "text": f"chunk {i}"} for i in range(6)]
+        calls = {"n": 0}
+
+        def embed(texts, model_name):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise RuntimeError("embedder failed on batch 2")
+            return [[0.1, 0.2, 0.3] for _ in texts]
+
+        client = mock.Mock()
+        with mock.patch.object(indexing, "INDEX_BATCH_SIZE", 2), mock.patch.object(
+            indexing, "embed_texts", side_effect=embed
+        ), mock.patch.object(indexing, "get_client", return_value=client), mock.patch.object(
+            indexing, "ensure_collection"
+        ):
+            with self.assertRaises(RuntimeError):
+                indexing.index_chunks({"doc_id": "doc-1", "chunks": chunks}, "http://qdrant", "model")
+
+        client.delete.assert_not_called()
+
+    def test_stale_points_deleted_after_all_upserts(self):
+        chunks = [{"chunk_id": f"c{i}", "text": f"chunk {i}"} for i in range(5)]
+        events = []
+        client = mock.Mock()
+        client.upsert.side_effect = lambda **kw: events.append("upsert")
+        client.delete.side_effect = lambda **kw: events.append("delete")
+
+        with mock.patch.object(indexing, "INDEX_BATCH_SIZE", 2), mock.patch.object(
+            indexing, "embed_texts", side_effect=lambda texts, model_name: [[0.1, 0.2] for _ in texts]
+        ), mock.patch.object(indexing, "get_client", return_value=client), mock.patch.object(
+            indexing, "ensure_collection"
+        ):
+            indexed, _ = indexing.index_chunks({"doc_id": "doc-1", "chunks": chunks}, "http://qdrant", "model")
+
+        self.assertEqual(indexed, 5)
+        self.assertEqual(events, ["upsert", "upsert", "upsert", "delete"])
+
+
+@unittest.skipIf(indexing is None, "ipdf indexing dependencies not installed")
+class BuildPointsTest(unittest.TestCase):
+    def test_uuid_with_trailing_newline_is_replaced(self):
+        raw_id = "123e4567-e89b-12d3-a456-426614174000"
+        chunks = [{"chunk_id": raw_id + "\n", "text": "a"}, {"chunk_id": raw_id, "text": "b"}]
+        points = indexing._build_points("doc-1", chunks, [[0.1], [0.2]], "model", 1)
+        self.assertNotEqual(points[0].id, raw_id + "\n")
+        self.assertEqual(points[1].id, raw_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ipdf import definitions_extractor, entitlements_extractor
+
+ENTITLEMENTS = {
+    "status": "OK",
+    "tables": [],
+    "products": [{"name": "Widget Pro", "metric": "user", "quantity": 10, "term": "1 year"}],
+}
+
+
+class UpdateReviewPackTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "review_pack.md"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_creates_the_pack(self):
+        entitlements_extractor.update_review_pack(self.path, ENTITLEMENTS)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertTrue(text.startswith("# Review Pack\n\n## Entitlements & Schedules\n"))
+        self.assertIn("| Widget Pro | user | 10 | 1 year |", text)
+
+    def test_replaces_a_middle_section_in_place(self):
+        self.path.write_text(
+            "# Review Pack\n\n## Entitlements & Schedules\n\nold — ünïcode\n\n## Definitions\n\nkept\n",
+            encoding="utf-8",
+        )
+        entitlements_extractor.update_review_pack(self.path, ENTITLEMENTS)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertNotIn("old", text)
+        self.assertEqual(text.count("## Entitlements & Schedules"), 1)
+        self.assertTrue(text.startswith("# Review Pack\n\n## Entitlements & Schedules\n"))
+        self.assertTrue(text.endswith("|\n\n\n## Definitions\n\nkept\n"))
+
+    def test_replaces_a_trailing_section(self):
+        self.path.write_text("# Review Pack\n\n## Entitlements & Schedules\n\nold\n", encoding="utf-8")
+        entitlements_extractor.update_review_pack(self.path, ENTITLEMENTS)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertNotIn("old", text)
+        self.assertTrue(text.endswith("| Widget Pro | user | 10 | 1 year |\n\n"))
+
+    def test_appends_a_missing_section(self):
+        definitions_extractor.update_review_pack(self.path, [{"term": "Affiliate", "definition": "a | b"}])
+        entitlements_extractor.update_review_pack(self.path, ENTITLEMENTS)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertLess(text.index("## Definitions"), text.index("## Entitlements & Schedules"))
+        self.assertIn("| Affiliate | a \\| b | — | — |\n\n## Entitlements", text)
+
+    def test_empty_pack(self):
+        self.path.write_bytes(b"")
+        entitlements_extractor.update_review_pack(self.path, ENTITLEMENTS)
+        self.assertTrue(self.path.read_text(encoding="utf-8").startswith("\n\n## Entitlements & Schedules\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
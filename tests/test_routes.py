@@ -0,0 +1,123 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import routes
+except ImportError:  # fastapi / httpx not installed
+    routes = None
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+@unittest.skipIf(routes is None, "app dependencies not installed")
+class DocumentRoutesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.processed = root / "processed"
+        self.doc_dir = self.processed / "doc-1"
+        self.doc_dir.mkdir(parents=True)
+        patches = [
+            mock.patch.object(routes, "PROCESSED_DIR", self.processed),
+            mock.patch.object(routes, "RAW_DIR", root / "raw"),
+            mock.patch.dict(routes._counts_cache, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        app = FastAPI()
+        app.include_router(routes.router)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, data):
+        (self.doc_dir / name).write_text(json.dumps(data), encoding="utf-8")
+
+    def test_processed_file_etags_per_encoding(self):
+        self._write("chunks.json", {"chunks": [{"text": "x" * 40}] * 100})
+        plain = self.client.get("/documents/doc-1/files/chunks.json", headers=IDENTITY)
+        zipped = self.client.get("/documents/doc-1/files/chunks.json", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(plain.status_code, 200)
+        self.assertIsNone(plain.headers.get("content-encoding"))
+        self.assertEqual(zipped.headers.get("content-encoding"), "gzip")
+        self.assertEqual(zipped.json(), plain.json())
+        self.assertEqual(zipped.headers["etag"], plain.headers["etag"][:-1] + '-gz"')
+        self.assertEqual(zipped.headers["vary"], "Accept-Encoding")
+
+        cached = self.client.get(
+            "/documents/doc-1/files/chunks.json",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]},
+        )
+        self.assertEqual(cached.status_code, 304)
+        # An identity ETag never revalidates the gzip variant, or the reverse.
+        crossed = self.client.get(
+            "/documents/doc-1/files/chunks.json",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["etag"]},
+        )
+        self.assertEqual(crossed.status_code, 200)
+        crossed = self.client.get(
+            "/documents/doc-1/files/chunks.json",
+            headers={**IDENTITY, "If-None-Match": zipped.headers["etag"]},
+        )
+        self.assertEqual(crossed.status_code, 200)
+
+    def test_extractions_section(self):
+        self._write("extractions.json", {"definitions": [{"term": "t" * 40}] * 100, "entitlements": {"products": []}})
+        zipped = self.client.get("/documents/doc-1/extractions/definitions", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(zipped.headers.get("content-encoding"), "gzip")
+        self.assertEqual(set(zipped.json()), {"definitions"})
+        self.assertTrue(zipped.headers["etag"].endswith('-definitions-gz"'))
+        cached = self.client.get(
+            "/documents/doc-1/extractions/definitions",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]},
+        )
+        self.assertEqual(cached.status_code, 304)
+        crossed = self.client.get(
+            "/documents/doc-1/extractions/definitions",
+            headers={**IDENTITY, "If-None-Match": zipped.headers["etag"]},
+        )
+        self.assertEqual(crossed.status_code, 200)
+        self.assertIsNone(crossed.headers.get("content-encoding"))
+
+        small = self.client.get("/documents/doc-1/extractions/entitlements", headers={"Accept-Encoding": "gzip"})
+        self.assertIsNone(small.headers.get("content-encoding"))
+        self.assertEqual(small.json(), {"entitlements": {"products": []}})
+        self.assertEqual(self.client.get("/documents/doc-1/extractions/tables").status_code, 400)
+
+    def test_summary_counts(self):
+        self._write("chunks.json", {"chunks": [{}, {}, {}]})
+        self._write("extractions.json", {"definitions": [{}], "entitlements": {"products": [{}, {}]}})
+        body = self.client.get("/documents/doc-1/summary").json()
+        self.assertEqual(
+            (body["chunks_count"], body["definitions_count"], body["entitlements_count"]), (3, 1, 2)
+        )
+        self._write("chunks.json", {"chunks": [{}]})
+        self.assertEqual(self.client.get("/documents/doc-1/summary").json()["chunks_count"], 1)
+        self.assertEqual(self.client.get("/documents/missing/summary").status_code, 404)
+
+    def test_feedback_batch(self):
+        items = [
+            {"item_type": "definitions", "item_id": "Affiliate", "verdict": "correct"},
+            {"item_type": "entitlements", "item_id": "Widget", "verdict": "incorrect", "note": "qty"},
+        ]
+        r = self.client.post("/documents/doc-1/feedback:batch", json=items)
+        self.assertEqual(r.json(), {"status": "ok", "count": 2})
+        entries = json.loads((self.doc_dir / "feedback.json").read_text(encoding="utf-8"))["entries"]
+        self.assertEqual([e["item_id"] for e in entries], ["Affiliate", "Widget"])
+        self.assertTrue(all(e["doc_id"] == "doc-1" and e["submitted_at"] for e in entries))
+        self.assertEqual(self.client.post("/documents/missing/feedback:batch", json=items).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
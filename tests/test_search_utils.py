@@ -0,0 +1,28 @@
+import unittest
+
+from ipdf.search_utils import section_path_contains
+
+
+class SectionPathContainsTest(unittest.TestCase):
+    def test_matches_within_a_segment(self):
+        self.assertTrue(section_path_contains(["Definitions", "Schedule A"], "schedule"))
+        self.assertFalse(section_path_contains(["Definitions", "Schedule A"], "exhibit"))
+
+    def test_matches_across_the_separator(self):
+        self.assertTrue(section_path_contains(["Definitions", "Schedule A"], "definitions > sched"))
+        self.assertFalse(section_path_contains(["Definitions", "Schedule A"], "schedule a > definitions"))
+
+    def test_whitespace_edged_needle_uses_the_joined_path(self):
+        self.assertTrue(section_path_contains(["Definitions", "Schedule A"], "Definitions "))
+        self.assertTrue(section_path_contains(["Definitions", "Schedule A"], " Schedule"))
+        self.assertFalse(section_path_contains(["Schedule A", "Definitions"], "Definitions "))
+
+    def test_non_list_paths(self):
+        self.assertTrue(section_path_contains("Definitions > Schedule A", "Definitions "))
+        self.assertTrue(section_path_contains("Definitions", "defin"))
+        self.assertFalse(section_path_contains(None, "defin"))
+        self.assertTrue(section_path_contains(None, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+try:
+    import storage
+except ImportError:  # fastapi not installed
+    storage = None
+
+
+@unittest.skipIf(storage is None, "app dependencies not installed")
+class StorageHelpersTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_json_round_trip(self):
+        data = {"name": "Ünïcode", "items": [1, 2]}
+        pretty = self.dir / "pretty.json"
+        compact = self.dir / "nested" / "compact.json"
+        storage.write_json(pretty, data)
+        storage.write_json(compact, data, compact=True)
+        self.assertEqual(storage.read_json(pretty), data)
+        self.assertEqual(storage.read_json(compact), data)
+        self.assertNotIn(" ", compact.read_text(encoding="utf-8").replace("Ünïcode", ""))
+        self.assertIsNone(storage.read_json(self.dir / "missing.json"))
+
+    def test_append_feedback_entries(self):
+        storage.append_feedback(self.dir, {"verdict": "correct"})
+        storage.append_feedback_entries(self.dir, [{"verdict": "incorrect"}, {"verdict": "partial"}])
+        entries = storage.read_json(self.dir / "feedback.json")["entries"]
+        self.assertEqual([e["verdict"] for e in entries], ["correct", "incorrect", "partial"])
+
+    def test_gzipped_copy_is_reused_until_the_source_changes(self):
+        path = self.dir / "chunks.json"
+        path.write_text("a" * 4096, encoding="utf-8")
+        gz_path, stamp = storage.gzipped_copy(path)
+        self.assertEqual(gzip.decompress(gz_path.read_bytes()), path.read_bytes())
+        self.assertEqual(stamp, (path.stat().st_mtime_ns, path.stat().st_size))
+        self.assertEqual(storage.gzipped_copy(path), (gz_path, stamp))
+
+        path.write_text("b" * 5000, encoding="utf-8")
+        os.utime(path, ns=(stamp[0] + 10**9, stamp[0] + 10**9))
+        new_gz, new_stamp = storage.gzipped_copy(path)
+        self.assertNotEqual(new_stamp, stamp)
+        self.assertEqual(gzip.decompress(new_gz.read_bytes()), b"b" * 5000)
+        self.assertFalse(gz_path.exists())
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), sorted(["chunks.json", new_gz.name]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,10 @@
+import json
+
 import streamlit as st
+import streamlit.components.v1 as components
+
+from ui_constants import TABLE_PAGE_SIZE
+from ui_utils import enqueue_feedback, feedback_status
 
 
 def build_doc_options(docs: list[dict]) -> tuple[dict, dict]:
@@ -18,3 +24,55 @@ def select_document(docs: list[dict], label: str = "Document") -> str | None:
     options, _ = build_doc_options(docs)
     selected = st.selectbox(label, options=[""] + list(options.keys()))
     return options.get(selected)
+
+
+def submit_feedback(doc_id: str, payload: dict, key: str) -> None:
+    # Queues the item and remembers its id under `key`, for this session's feedback_badge.
+    _, sub_id = enqueue_feedback(doc_id, payload)
+    st.session_state.setdefault(key, []).append(sub_id)
+    st.success("Feedback queued.")
+
+
+def feedback_badge(key: str) -> None:
+    # Rendered inside the submitting panel; counts only this session's submissions.
+    pending, failed = feedback_status(st.session_state.get(key, []))
+    if pending:
+        st.caption(f"Pending feedback: {pending}")
+    if failed:
+        st.warning(f"{failed} feedback item(s) could not be saved.")
+
+
+def paginate(rows, key: str, page_size: int = TABLE_PAGE_SIZE):
+    # Works on lists and DataFrames alike; only the current page is sent to the browser.
+    total = len(rows)
+    pages = max(1, -(-total // page_size))
+    if pages == 1:
+        return rows
+    # Seeded through session state only; passing value= as well makes Streamlit warn.
+    st.session_state.setdefault(key, 1)
+    if st.session_state[key] > pages:
+        st.session_state[key] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=key)
+    start = (int(page) - 1) * page_size
+    st.caption(f"Rows {start + 1}–{min(start + page_size, total)} of {total}")
+    return rows[start : start + page_size]
+
+
+# Subscribes the browser to the document's event stream and clicks the page's refresh
+# button only when the backend reports a change from `current`.
+def watch_document_events(events_url: str, current: dict, button_label: str = "Refresh") -> None:
+    script = f"""
+    <script>
+    const doc = window.parent.document;
+    let current = {json.dumps(current)};
+    const es = new EventSource({json.dumps(events_url)});
+    es.onmessage = (e) => {{
+        const d = JSON.parse(e.data);
+        if (Object.keys(current).every((k) => d[k] === current[k])) return;
+        current = d;
+        const btn = Array.from(doc.querySelectorAll("button")).find((b) => b.innerText.trim() === {json.dumps(button_label)});
+        if (btn) btn.click();
+    }};
+    </script>
+    """
+    components.html(script, height=0)
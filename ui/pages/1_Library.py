@@ -1,10 +1,8 @@
-from io import BytesIO
 import time
 
-import requests
 import streamlit as st
 
-from ui_utils import api_url, fetch_documents
+from ui_utils import fetch_documents, post_upload
 from ui_theme import apply_base_theme, status_pill
 
 
@@ -15,34 +13,27 @@ st.markdown('<div class="subtitle">Upload and track contracts through the pipeli
 
 top_cols = st.columns([1, 1, 1, 3])
 if top_cols[0].button("Refresh"):
+    fetch_documents.clear()
     st.rerun()
 auto_refresh = top_cols[1].toggle("Auto-refresh", value=False)
 refresh_sec = top_cols[2].selectbox("Every", options=[5, 10, 15, 30], index=1)
 
-
-def status_badge(text: str) -> str:
-    return status_pill(text or "unknown")
-
 with st.expander("Upload a document", expanded=False):
     f = st.file_uploader("PDF or DOCX", type=["pdf", "docx"], accept_multiple_files=False)
     if f is not None:
         if st.button("Upload", type="primary"):
-            try:
-                files = {"file": (f.name, BytesIO(f.getvalue()), f.type or "application/octet-stream")}
-                r = requests.post(api_url("/upload"), files=files, timeout=30)
-                if r.ok:
-                    doc_id = r.json().get("doc_id")
-                    if doc_id:
-                        st.session_state["current_doc_id"] = doc_id
-                        st.switch_page("pages/2_Document_Detail.py")
-                    st.success(f"Uploaded: {doc_id}")
-                else:
-                    st.error(f"Upload failed: {r.status_code} {r.text}")
-            except Exception as e:
-                st.error(f"Upload error: {e}")
+            ok, body = post_upload(f.name, f.getvalue(), f.type)
+            if ok:
+                fetch_documents.clear()
+                doc_id = body.get("doc_id")
+                if doc_id:
+                    st.session_state["current_doc_id"] = doc_id
+                    st.switch_page("pages/2_Document_Detail.py")
+                st.success(f"Uploaded: {doc_id}")
+            else:
+                st.error(f"Upload failed: {body}")
 
 st.subheader("Documents")
-placeholder = st.empty()
 
 docs = fetch_documents()
 if not docs:
@@ -55,7 +46,7 @@ else:
             short_id = (d.get("doc_id") or "")[:8]
             cols[0].markdown(f"**{filename}**")
             cols[1].caption(f"id: {short_id}")
-            cols[2].markdown(status_badge(d.get("status", "?")), unsafe_allow_html=True)
+            cols[2].markdown(status_pill(d.get("status", "?")), unsafe_allow_html=True)
             cols[3].markdown(f"Pages: {d.get('page_count') or '—'}")
             open_detail = cols[4].button("Open", key=f"open-{d['doc_id']}")
             if open_detail:
@@ -67,4 +58,5 @@ else:
 
     if auto_refresh:
         time.sleep(refresh_sec)
+        fetch_documents.clear()
         st.rerun()
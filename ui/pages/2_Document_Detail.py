@@ -1,7 +1,9 @@
-import time
+import pandas as pd
 import streamlit as st
 
-from ui_utils import api_url, fetch_document, fetch_chunks, fetch_chunks_json, post_process, post_rechunk, post_reindex, post_rename
+from components import watch_document_events
+from ui_utils import public_api_url, fetch_document, fetch_chunks, fetch_doc_summary, fetch_json_versioned, fetch_page_image, invalidate, post_process, post_rechunk, post_reindex, post_rename
+from ui_constants import OCR_MODES, SETTLED_STATUSES, STATUS_MESSAGES, STATUS_STEPS
 from ui_theme import apply_base_theme, status_pill
 
 
@@ -10,10 +12,6 @@ apply_base_theme()
 st.markdown('<div class="app-title">Document Detail</div>', unsafe_allow_html=True)
 st.markdown('<div class="subtitle">Review sections, evidence, and extracted results.</div>', unsafe_allow_html=True)
 
-
-def status_badge(text: str) -> str:
-    return status_pill(text or "unknown")
-
 doc_id = st.session_state.get("current_doc_id") or st.query_params.get("doc_id", [None])[0]
 if not doc_id:
     st.warning("No document selected. Go to Library.")
@@ -22,23 +20,32 @@ if not doc_id:
 
 top_cols = st.columns([1, 1, 2])
 if top_cols[0].button("Refresh"):
+    fetch_document.clear()
     st.rerun()
-auto_refresh = top_cols[1].toggle("Auto-refresh", value=False)
 top_cols[2].caption(f"doc_id: {doc_id[:8]}…")
 
-refresh_row = st.columns([1, 3])
-refresh_sec = refresh_row[0].selectbox("Every", options=[5, 10, 15, 30], index=1)
-refresh_row[1].caption("Auto-refresh will run while this page is open.")
+st.caption("Auto-refresh updates the page when the backend reports a status change.")
 
 doc = fetch_document(doc_id)
 if not doc:
     st.error("Document not found")
     st.stop()
 
+status = (doc.get("status") or "").upper()
+def_status = doc.get("definitions_status")
+ent_status = doc.get("entitlements_status")
+extractor_running = "RUNNING" in {(def_status or "").upper(), (ent_status or "").upper()}
+if status in SETTLED_STATUSES and not extractor_running:
+    # Nothing left to wait for: no background reruns on finished documents.
+    auto_refresh = top_cols[1].toggle("Auto-refresh", value=False, disabled=True, help="Processing has finished; nothing to poll.")
+    top_cols[1].markdown('<span class="pill pill-ready">Live — up to date</span>', unsafe_allow_html=True)
+else:
+    auto_refresh = top_cols[1].toggle("Auto-refresh", value=False)
+
 cols = st.columns([2, 1, 1, 2])
 display_name = doc.get("display_name")
 cols[0].markdown(f"**Name:** {display_name or doc.get('filename')}")
-cols[1].markdown(status_badge(doc.get("status", "?")), unsafe_allow_html=True)
+cols[1].markdown(status_pill(doc.get("status", "?")), unsafe_allow_html=True)
 cols[2].markdown(f"Has chunks: {'✅' if doc.get('has_chunks') else '❌'}")
 if cols[3].button("Open Search with this doc", type="primary"):
     st.session_state["search_doc_ids"] = [doc_id]
@@ -49,6 +56,7 @@ with st.expander("Rename document", expanded=False):
     if st.button("Save name"):
         ok, msg = post_rename(doc_id, new_name or None)
         if ok:
+            invalidate()
             st.success("Name updated.")
         else:
             st.error(f"Rename failed: {msg}")
@@ -82,35 +90,53 @@ if pre:
             if pre.get("language_source") == "insufficient_text":
                 st.caption("Detected language: not enough text to infer.")
 
-status = (doc.get("status") or "").upper()
-status_messages = {
-    "AWAITING_OPTIONS": "Awaiting processing options…",
-    "QUEUED": "Queued for processing…",
-    "PARSING": "Processing PDF with Docling…",
-    "CHUNKING": "Chunking text into reviewable sections…",
-    "INDEXING": "Indexing for semantic search…",
-    "READY": "Ready for review.",
-    "PARSED_LOW_CONFIDENCE": "Parsed with fallback parser; results may be lower fidelity.",
-}
-stage_message = doc.get("stage_message")
-msg = stage_message or status_messages.get(status)
-if msg and status != "READY":
-    st.info(msg)
-if status == "PARSED_LOW_CONFIDENCE":
-    st.warning("Parsed with fallback parser. OCR or a higher-quality parse may improve results.")
-
-status_steps = {
-    "AWAITING_OPTIONS": 0,
-    "QUEUED": 0,
-    "PARSING": 1,
-    "CHUNKING": 2,
-    "INDEXING": 3,
-    "READY": 4,
-    "PARSED_LOW_CONFIDENCE": 4,
-}
-step = status_steps.get(status, 0)
-st.progress(step / 4 if step else 0)
-st.caption(f"Stage {step} of 4")
+# Cache key for the summary counts; changes whenever the files may have been rewritten.
+files_version = f"{status}|{def_status}|{ent_status}"
+links = doc.get("links") or {}
+chunks_link = links.get("chunks.json")
+
+
+def _build_chunk_index(chunks: list):
+    section_strs = []
+    for ch in chunks:
+        path = ch.get("section_path") or []
+        section_strs.append(" > ".join(path) if isinstance(path, list) else str(path))
+    paths = sorted({p for p in section_strs if p})
+    by_id = {(c.get("chunk_id") or c.get("id")): c for c in chunks}
+    # Lowercased once per load so the "Text contains" filter never re-lowers chunk text.
+    lc_texts = [(c.get("text") or c.get("text_preview", "")).lower() for c in chunks]
+    return chunks, section_strs, paths, by_id, lc_texts
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=8)
+def _index_chunks(doc_id: str, version: str, _chunks: list):
+    # Keyed on the chunks.json ETag, so a re-chunk is seen by every session at once.
+    return _build_chunk_index(_chunks)
+
+
+def load_chunk_index(doc_id: str, chunks_link: str | None):
+    chunks_data, version = fetch_json_versioned(chunks_link) if chunks_link else (None, None)
+    if isinstance(chunks_data, dict):
+        chunks = chunks_data.get("chunks") or []
+        if version:
+            return _index_chunks(doc_id, version, chunks)
+        return _build_chunk_index(chunks)
+    return _build_chunk_index(fetch_chunks(doc_id))
+
+
+def render_status(d: dict) -> None:
+    s = (d.get("status") or "").upper()
+    msg = d.get("stage_message") or STATUS_MESSAGES.get(s)
+    if msg and s != "READY":
+        st.info(msg)
+    if s == "PARSED_LOW_CONFIDENCE":
+        st.warning("Parsed with fallback parser. OCR or a higher-quality parse may improve results.")
+    step = STATUS_STEPS.get(s, 0)
+    st.progress(step / 4 if step else 0)
+    st.caption(f"Stage {step} of 4")
+
+
+render_status(doc)
 
 opts = doc.get("processing_options") or {}
 page_count = pre.get("page_count") or doc.get("page_count")
@@ -135,24 +161,11 @@ if opts.get("page_start") and opts.get("page_end"):
         pages_processed = None
 summary_cols[0].metric("Pages processed", pages_processed or doc.get("page_count") or 0)
 
-chunks_count = 0
-if doc.get("has_chunks") and doc.get("links", {}).get("chunks.json"):
-    _chunks = fetch_chunks_json(doc.get("links", {}).get("chunks.json"))
-    if _chunks and isinstance(_chunks, dict):
-        chunks_count = len(_chunks.get("chunks") or [])
-summary_cols[1].metric("Chunks", chunks_count)
-
-defs_count = 0
-ents_count = 0
-extractions_link = (doc.get("links") or {}).get("extractions.json")
-if extractions_link:
-    ex = fetch_chunks_json(extractions_link)
-    if ex:
-        defs_count = len(ex.get("definitions") or [])
-        ent = ex.get("entitlements") or {}
-        ents_count = len(ent.get("products") or [])
-summary_cols[2].metric("Definitions", defs_count)
-summary_cols[3].metric("Entitlements", ents_count)
+# Counts come from the backend so the metrics never download chunks or extractions.
+counts = fetch_doc_summary(doc_id, files_version)
+summary_cols[1].metric("Chunks", counts.get("chunks_count", 0))
+summary_cols[2].metric("Definitions", counts.get("definitions_count", 0))
+summary_cols[3].metric("Entitlements", counts.get("entitlements_count", 0))
 
 st.subheader("Processing Options")
 st.caption("Select a page range and which outputs to generate before processing.")
@@ -191,8 +204,8 @@ with st.form("process_options"):
     ocr_default = (opts.get("ocr_mode") or "auto").lower()
     ocr_mode = st.selectbox(
         "OCR mode",
-        options=["auto", "force", "off"],
-        index=["auto", "force", "off"].index(ocr_default) if ocr_default in {"auto", "force", "off"} else 0,
+        options=OCR_MODES,
+        index=OCR_MODES.index(ocr_default) if ocr_default in OCR_MODES else 0,
         disabled=processing_busy,
         help="Auto enables OCR only for scanned/low-text docs.",
     )
@@ -219,6 +232,8 @@ with st.form("process_options"):
         }
         ok, msg = post_process(doc_id, payload)
         if ok:
+            invalidate()
+            _index_chunks.clear()
             st.success("Processing queued. Use Refresh to track progress.")
         else:
             st.error(f"Processing failed: {msg}")
@@ -231,19 +246,21 @@ act_cols = st.columns([1, 1, 3])
 if act_cols[0].button("Re-chunk"):
     ok, msg = post_rechunk(doc_id)
     if ok:
+        invalidate()
+        _index_chunks.clear()
         st.success("Re-chunk queued. Click Refresh to see status updates.")
     else:
         st.error(f"Re-chunk failed: {msg}")
 if act_cols[1].button("Re-index"):
     ok, msg = post_reindex(doc_id)
     if ok:
+        invalidate()
+        _index_chunks.clear()
         st.success("Re-index queued. Click Refresh to see status updates.")
     else:
         st.error(f"Re-index failed: {msg}")
 act_cols[2].caption("Tip: Re-chunk after ingest if sections look off. Re-index after chunking to refresh search.")
 
-def_status = doc.get("definitions_status")
-ent_status = doc.get("entitlements_status")
 if def_status:
     st.caption(f"Definitions extractor: {def_status}")
 if ent_status:
@@ -261,6 +278,8 @@ if ex_cols[0].button("Run Definitions"):
 
     ok, msg = post_extract_definitions(doc_id)
     if ok:
+        invalidate()
+        _index_chunks.clear()
         st.success("Definitions extraction queued. Click Refresh to update.")
     else:
         st.error(f"Definitions extraction failed: {msg}")
@@ -269,6 +288,8 @@ if ex_cols[1].button("Run Entitlements"):
 
     ok, msg = post_extract_entitlements(doc_id)
     if ok:
+        invalidate()
+        _index_chunks.clear()
         st.success("Entitlements extraction queued. Click Refresh to update.")
     else:
         st.error(f"Entitlements extraction failed: {msg}")
@@ -283,65 +304,47 @@ icols[1].markdown(f"Pages: {doc.get('page_count') if doc.get('page_count') is no
 if opts.get("page_start") or opts.get("page_end"):
     st.caption(f"Selected pages: {opts.get('page_start') or '—'}–{opts.get('page_end') or '—'}")
 
-links = (doc.get("links") or {})
 text_link = links.get("document_text.txt")
 json_link = links.get("document.json")
-chunks_link = links.get("chunks.json")
 debug_link = links.get("chunk_debug.md")
 
 btn_cols = icols[2].columns(2)
 if text_link:
-    btn_cols[0].link_button("Open document_text.txt", api_url(text_link))
+    btn_cols[0].link_button("Open document_text.txt", public_api_url(text_link))
 if json_link:
-    btn_cols[1].link_button("Open document.json", api_url(json_link))
+    btn_cols[1].link_button("Open document.json", public_api_url(json_link))
 if chunks_link:
     btn_cols = st.columns(2)
-    btn_cols[0].link_button("Open chunks.json", api_url(chunks_link))
+    btn_cols[0].link_button("Open chunks.json", public_api_url(chunks_link))
 if debug_link:
-    st.link_button("Open chunk_debug.md", api_url(debug_link))
+    st.link_button("Open chunk_debug.md", public_api_url(debug_link))
 
 errors = doc.get("errors") or []
 if errors:
     st.error("\n".join(errors))
 
-st.subheader("Chunks")
-chunks_data = None
-if chunks_link:
-    chunks_data = fetch_chunks_json(chunks_link)
-
-chunks = []
-if chunks_data and isinstance(chunks_data, dict):
-    chunks = chunks_data.get("chunks") or []
-else:
-    chunks = fetch_chunks(doc_id)
-
-if not chunks:
-    st.info("No chunks yet.")
-else:
-    section_paths = []
-    for ch in chunks:
-        path = ch.get("section_path") or []
-        if isinstance(path, list):
-            section_paths.append(" > ".join(path))
-        elif path:
-            section_paths.append(str(path))
-    section_paths = sorted({p for p in section_paths if p})
-
+@st.fragment
+def chunks_panel(doc_id: str, chunk_index: tuple) -> None:
+    chunks, section_strs, section_paths, chunks_by_id, chunk_texts_lc = chunk_index
+    if not chunks:
+        st.info("No chunks yet.")
+        return
     left, middle, right = st.columns([1, 2, 2])
 
     with left:
         st.markdown("**Sections**")
-        section_filter = st.selectbox("Filter by section", options=["All"] + section_paths)
-        text_filter = st.text_input("Text contains")
-        max_show = st.slider("Max chunks", min_value=10, max_value=300, value=80, step=10)
+        with st.form("chunk_filters", clear_on_submit=False, border=False):
+            section_filter = st.selectbox("Filter by section", options=["All"] + section_paths)
+            text_filter = st.text_input("Text contains")
+            max_show = st.slider("Max chunks", min_value=10, max_value=300, value=80, step=10)
+            st.form_submit_button("Apply")
 
+    text_filter_lc = text_filter.lower()
     filtered = []
-    for ch in chunks:
-        section_path = ch.get("section_path") or []
-        section_str = " > ".join(section_path) if isinstance(section_path, list) else str(section_path or "")
+    for section_str, ch, text_lc in zip(section_strs, chunks, chunk_texts_lc):
         if section_filter != "All" and section_str != section_filter:
             continue
-        if text_filter and text_filter.lower() not in (ch.get("text") or ch.get("text_preview", "")).lower():
+        if text_filter_lc and text_filter_lc not in text_lc:
             continue
         filtered.append((section_str, ch))
 
@@ -351,24 +354,34 @@ else:
 
     with middle:
         st.markdown("**Chunk List**")
-        for section_str, ch in filtered[:max_show]:
-            with st.container(border=True):
-                stype = ch.get("semantic_type")
-                label = f"{ch.get('type','chunk')} — {section_str or '—'} — p.{ch.get('page_start')}–{ch.get('page_end')}"
-                if stype:
-                    label += f" • {stype}"
-                st.markdown(label)
-                st.write(ch.get("text_preview") or (ch.get("text", "")[:240] + "…"))
-                if st.button("View", key=f"view-{ch.get('chunk_id') or ch.get('id')}"):
-                    st.session_state["selected_chunk_id"] = ch.get("chunk_id") or ch.get("id")
+        shown = filtered[:max_show]
+        df = pd.DataFrame(
+            [
+                {
+                    "Section": section_str or "—",
+                    "Type": ch.get("type", "chunk"),
+                    "Pages": f"{ch.get('page_start')}–{ch.get('page_end')}",
+                    "Tag": ch.get("semantic_type") or "",
+                    "Preview": ch.get("text_preview") or (ch.get("text", "")[:240] + "…"),
+                }
+                for section_str, ch in shown
+            ],
+            index=[ch.get("chunk_id") or ch.get("id") for _section_str, ch in shown],
+        )
+        event = st.dataframe(
+            df,
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            use_container_width=True,
+            height=600,
+        )
+        if event.selection.rows:
+            st.session_state["selected_chunk_id"] = df.index[event.selection.rows[0]]
 
     with right:
         st.markdown("**Chunk Viewer**")
-        selected = None
-        for _section_str, ch in filtered:
-            if (ch.get("chunk_id") or ch.get("id")) == st.session_state.get("selected_chunk_id"):
-                selected = ch
-                break
+        selected = chunks_by_id.get(st.session_state.get("selected_chunk_id"))
         if not selected and filtered:
             selected = filtered[0][1]
 
@@ -385,11 +398,24 @@ else:
             show_image = st.toggle("Show page image", value=False)
             if show_image and selected.get("page_start"):
                 page_num = selected.get("page_start")
-                try:
-                    st.image(api_url(f"/documents/{doc_id}/pages/{page_num}"), caption=f"Page {page_num}")
-                except Exception:
+                image = fetch_page_image(doc_id, page_num)
+                if image:
+                    st.image(image, caption=f"Page {page_num}")
+                else:
                     st.info("Page image unavailable.")
 
-if auto_refresh and (status != "READY" or (def_status or "").upper() == "RUNNING"):
-    time.sleep(refresh_sec)
-    st.rerun()
+
+st.subheader("Chunks")
+chunks_panel(doc_id, load_chunk_index(doc_id, chunks_link))
+
+if auto_refresh:
+    # The backend pushes status snapshots; the page reruns only on a real change.
+    watch_document_events(
+        public_api_url(f"/documents/{doc_id}/events"),
+        {
+            "status": doc.get("status"),
+            "definitions_status": def_status,
+            "entitlements_status": ent_status,
+            "stage_message": doc.get("stage_message"),
+        },
+    )
@@ -1,8 +1,8 @@
-import requests
+import pandas as pd
 import streamlit as st
 
 from components import build_doc_options
-from ui_utils import api_url, fetch_documents
+from ui_utils import fetch_documents, post_search
 from ui_theme import apply_base_theme
 
 
@@ -62,33 +62,42 @@ if st.button("Search", type="primary"):
             "page_end": int(page_end) or None,
         },
     }
-    try:
-        r = requests.post(api_url("/search"), json=payload, timeout=20)
-        if not r.ok:
-            st.error(f"Search failed: {r.status_code} {r.text}")
-        else:
-            hits = r.json() or []
-            st.session_state["search_results"] = hits
-            if hits:
-                st.session_state["selected_result"] = 0
-    except Exception as e:
-        st.error(f"Search error: {e}")
+    ok, body = post_search(payload)
+    if not ok:
+        st.error(f"Search failed: {body}")
+    else:
+        hits = body or []
+        st.session_state["search_results"] = hits
+        if hits:
+            st.session_state["selected_result"] = 0
 
 results = st.session_state.get("search_results", [])
 if results:
     st.subheader("Results")
     left, right = st.columns([2, 1])
     with left:
-        for i, h in enumerate(results):
+        rows = []
+        for h in results:
             ev = h.get("evidence", {})
-            filename = doc_map.get(ev.get("doc_id"), ev.get("doc_id"))
-            with st.container(border=True):
-                st.write(h.get("snippet", ""))
-                st.caption(
-                        f"{filename} • {ev.get('section_path')} • ref {ev.get('clause_ref')} • p.{ev.get('page_start')}–{ev.get('page_end')} • score={h.get('score')}"
-                )
-                if st.button("View", key=f"view-{i}"):
-                    st.session_state["selected_result"] = i
+            rows.append(
+                {
+                    "Score": h.get("score"),
+                    "File": doc_map.get(ev.get("doc_id"), ev.get("doc_id")),
+                    "Section": ev.get("section_path"),
+                    "Clause": ev.get("clause_ref"),
+                    "Pages": f"{ev.get('page_start')}–{ev.get('page_end')}",
+                    "Snippet": (h.get("snippet") or "")[:300],
+                }
+            )
+        event = st.dataframe(
+            pd.DataFrame(rows),
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            use_container_width=True,
+        )
+        if event.selection.rows:
+            st.session_state["selected_result"] = event.selection.rows[0]
 
     with right:
         idx = st.session_state.get("selected_result", 0)
@@ -1,7 +1,12 @@
+import hashlib
+import json
+
+import pandas as pd
 import streamlit as st
 
-from components import select_document
-from ui_utils import fetch_document, fetch_documents, fetch_chunks_json, post_extract_definitions, post_feedback, api_url
+from components import feedback_badge, paginate, select_document, submit_feedback
+from ui_utils import fetch_document_and_extractions, fetch_documents, invalidate, post_extract_definitions, public_api_url
+from ui_constants import DEFAULT_MAX_SELECT
 from ui_theme import apply_base_theme
 
 st.set_page_config(page_title="IPdf — Definitions", layout="wide")
@@ -16,7 +21,7 @@ if not doc_id:
     st.info("Select a document to run or view definitions.")
     st.stop()
 
-doc = fetch_document(doc_id)
+doc, extractions, version = fetch_document_and_extractions(doc_id, "definitions")
 if not doc:
     st.error("Document not found")
     st.stop()
@@ -28,89 +33,118 @@ col1, col2 = st.columns([1, 3])
 if col1.button("Run Definitions Extractor", type="primary"):
     ok, msg = post_extract_definitions(doc_id)
     if ok:
+        invalidate()
         st.success("Definitions extraction queued. Click Refresh to update.")
     else:
         st.error(f"Failed to start extraction: {msg}")
 if col2.button("Refresh"):
+    fetch_document_and_extractions.clear()
     st.rerun()
 
 links = doc.get("links") or {}
-extractions_link = links.get("extractions.json")
 csv_link = links.get("definitions.csv")
 review_link = links.get("review_pack.md")
 
 if csv_link:
-    st.link_button("Open definitions.csv", api_url(csv_link))
+    st.link_button("Open definitions.csv", public_api_url(csv_link))
 if review_link:
-    st.link_button("Open review_pack.md", api_url(review_link))
-
-definitions = []
-if extractions_link:
-    data = fetch_chunks_json(extractions_link)
-    if data:
-        definitions = data.get("definitions") or []
-
-if not definitions:
-    st.info("No definitions found yet.")
-    st.stop()
+    st.link_button("Open review_pack.md", public_api_url(review_link))
 
-st.subheader("Definitions Table")
-filter_cols = st.columns([2, 2, 1])
-term_filter = filter_cols[0].text_input("Filter by term")
-conf_min = filter_cols[1].slider("Min confidence", min_value=0.0, max_value=1.0, value=0.0, step=0.05)
-max_rows = filter_cols[2].number_input("Max rows", min_value=5, max_value=500, value=200, step=5)
 
-rows = []
-for d in definitions:
-    ev = (d.get("evidence") or [{}])[0]
-    rows.append(
+@st.cache_data(ttl=300, show_spinner=False, max_entries=8)
+def _definitions_df(doc_id: str, version: str, _definitions: list) -> pd.DataFrame:
+    # `_definitions` is not hashed by Streamlit; (doc_id, version) is the cache key.
+    raw = pd.json_normalize(_definitions).reindex(columns=["term", "definition", "confidence", "evidence"])
+    first_ev = raw["evidence"].map(lambda e: e[0] if isinstance(e, list) and e else {})
+    clause = first_ev.str.get("clause_ref")
+    return pd.DataFrame(
         {
-            "Term": d.get("term"),
-            "Definition": d.get("definition"),
-            "Confidence": d.get("confidence"),
-            "Page": ev.get("page_start"),
-            "Clause": ev.get("clause_ref") or "—",
+            "Term": raw["term"],
+            "Definition": raw["definition"],
+            "Confidence": pd.to_numeric(raw["confidence"], errors="coerce"),
+            "Page": first_ev.str.get("page_start"),
+            "Clause": clause.mask(clause.isna() | (clause == ""), "—"),
         }
     )
 
-filtered = []
-for r in rows:
-    if term_filter and term_filter.lower() not in (r.get("Term") or "").lower():
-        continue
-    if r.get("Confidence") is not None and r.get("Confidence") < conf_min:
-        continue
-    filtered.append(r)
-
-st.dataframe(filtered[: int(max_rows)], use_container_width=True)
-
-st.markdown("**Selected item**")
-selected_term = st.selectbox("Select term", options=[r["Term"] for r in filtered[: int(max_rows)]])
-selected = next((d for d in definitions if d.get("term") == selected_term), None)
-if selected:
-    ev = (selected.get("evidence") or [{}])[0]
-    st.markdown(f"**{selected.get('term')}**")
-    st.write(selected.get("definition"))
-    st.caption(
-        f"p.{ev.get('page_start')}–{ev.get('page_end')} • clause {ev.get('clause_ref') or '—'}"
+
+# Kept per session and keyed on the extractions ETag: an unchanged payload skips the
+# table rebuild (and the cache_data copy of it) on every full-page rerun.
+session_key = ("defs", doc_id)
+cached = st.session_state.get(session_key)
+if version and cached and cached[0] == version:
+    _, df, by_term = cached
+else:
+    definitions = (extractions or {}).get("definitions") or []
+    if not definitions:
+        st.info("No definitions found yet.")
+        st.stop()
+    version = version or hashlib.sha1(json.dumps(definitions, default=str).encode("utf-8")).hexdigest()
+    df = _definitions_df(doc_id, version, definitions)
+    # Reversed so the first definition of a repeated term wins, as with a linear scan.
+    by_term = {d.get("term"): d for d in reversed(definitions)}
+    st.session_state[session_key] = (version, df, by_term)
+
+
+@st.fragment
+def _definitions_panel(df: pd.DataFrame, by_term: dict, doc_id: str) -> None:
+    st.subheader("Definitions Table")
+    with st.form("definition_filters", border=False):
+        filter_cols = st.columns([2, 2, 1], vertical_alignment="bottom")
+        term_filter = filter_cols[0].text_input("Filter by term")
+        conf_min = filter_cols[1].slider("Min confidence", min_value=0.0, max_value=1.0, value=0.0, step=0.05)
+        filter_cols[2].form_submit_button("Apply")
+
+    mask = df["Confidence"].isna() | (df["Confidence"] >= conf_min)
+    if term_filter:
+        mask &= df["Term"].str.contains(term_filter, case=False, na=False, regex=False)
+    shown = paginate(df.loc[mask], "definitions_page")
+
+    # Fixed widths spare the grid from measuring every cell to auto-size columns.
+    st.dataframe(
+        shown,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Term": st.column_config.TextColumn(width="medium"),
+            "Definition": st.column_config.TextColumn(width="large"),
+            "Confidence": st.column_config.NumberColumn(width="small", format="%.2f"),
+            "Page": st.column_config.NumberColumn(width="small"),
+            "Clause": st.column_config.TextColumn(width="small"),
+        },
     )
-    with st.expander("Feedback", expanded=False):
-        verdict = st.radio("Is this correct?", options=["Correct", "Incorrect", "Partially correct"], horizontal=True)
-        note = st.text_area("Notes (optional)")
-        if st.button("Submit feedback"):
-            payload = {
-                "item_type": "definitions",
-                "item_id": selected.get("term"),
-                "verdict": verdict.lower().replace(" ", "_"),
-                "note": note or None,
-                "evidence": {
-                    "chunk_id": ev.get("chunk_id"),
-                    "page_start": ev.get("page_start"),
-                    "page_end": ev.get("page_end"),
-                    "clause_ref": ev.get("clause_ref"),
-                },
-            }
-            ok, msg = post_feedback(doc_id, payload)
-            if ok:
-                st.success("Feedback saved. Thank you.")
-            else:
-                st.error(f"Feedback failed: {msg}")
+
+    st.markdown("**Selected item**")
+    terms = shown["Term"].tolist()
+    selected_term = st.selectbox("Select term", options=terms[:DEFAULT_MAX_SELECT])
+    if len(terms) > DEFAULT_MAX_SELECT:
+        st.caption(f"Showing first {DEFAULT_MAX_SELECT} of {len(terms)} — refine the term filter to narrow.")
+    selected = by_term.get(selected_term)
+    if selected:
+        ev = (selected.get("evidence") or [{}])[0]
+        st.markdown(f"**{selected.get('term')}**")
+        st.write(selected.get("definition"))
+        st.caption(
+            f"p.{ev.get('page_start')}–{ev.get('page_end')} • clause {ev.get('clause_ref') or '—'}"
+        )
+        with st.expander("Feedback", expanded=False):
+            verdict = st.radio("Is this correct?", options=["Correct", "Incorrect", "Partially correct"], horizontal=True)
+            note = st.text_area("Notes (optional)")
+            if st.button("Submit feedback"):
+                payload = {
+                    "item_type": "definitions",
+                    "item_id": selected.get("term"),
+                    "verdict": verdict.lower().replace(" ", "_"),
+                    "note": note or None,
+                    "evidence": {
+                        "chunk_id": ev.get("chunk_id"),
+                        "page_start": ev.get("page_start"),
+                        "page_end": ev.get("page_end"),
+                        "clause_ref": ev.get("clause_ref"),
+                    },
+                }
+                submit_feedback(doc_id, payload, "definitions_feedback")
+            feedback_badge("definitions_feedback")
+
+
+_definitions_panel(df, by_term, doc_id)
@@ -1,7 +1,7 @@
 import streamlit as st
 
-from components import select_document
-from ui_utils import fetch_document, fetch_documents, fetch_chunks_json, post_extract_entitlements, post_feedback, api_url
+from components import feedback_badge, paginate, select_document, submit_feedback
+from ui_utils import fetch_document_and_extractions, fetch_documents, invalidate, post_extract_entitlements, public_api_url
 from ui_theme import apply_base_theme
 
 st.set_page_config(page_title="IPdf — Entitlements", layout="wide")
@@ -16,7 +16,7 @@ if not doc_id:
     st.info("Select a document to run or view entitlements.")
     st.stop()
 
-doc = fetch_document(doc_id)
+doc, extractions, _version = fetch_document_and_extractions(doc_id, "entitlements")
 if not doc:
     st.error("Document not found")
     st.stop()
@@ -28,27 +28,24 @@ col1, col2 = st.columns([1, 3])
 if col1.button("Run Entitlements Extractor", type="primary"):
     ok, msg = post_extract_entitlements(doc_id)
     if ok:
+        invalidate()
         st.success("Entitlements extraction queued. Click Refresh to update.")
     else:
         st.error(f"Failed to start extraction: {msg}")
 if col2.button("Refresh"):
+    fetch_document_and_extractions.clear()
     st.rerun()
 
 links = doc.get("links") or {}
-extractions_link = links.get("extractions.json")
 csv_link = links.get("entitlements.csv")
 review_link = links.get("review_pack.md")
 
 if csv_link:
-    st.link_button("Open entitlements.csv", api_url(csv_link))
+    st.link_button("Open entitlements.csv", public_api_url(csv_link))
 if review_link:
-    st.link_button("Open review_pack.md", api_url(review_link))
+    st.link_button("Open review_pack.md", public_api_url(review_link))
 
-entitlements = {}
-if extractions_link:
-    data = fetch_chunks_json(extractions_link)
-    if data:
-        entitlements = data.get("entitlements") or {}
+entitlements = (extractions or {}).get("entitlements") or {}
 
 if not entitlements:
     st.info("No entitlements found yet.")
@@ -58,56 +55,76 @@ status = entitlements.get("status")
 if status and status != "OK":
     st.warning(f"Status: {status}")
 
-st.subheader("Tables")
-for t in entitlements.get("tables") or []:
-    st.markdown(f"**{t.get('title') or 'Table'}**")
-    rows = t.get("rows") or []
-    if rows:
-        st.dataframe(rows, use_container_width=True)
+
+@st.fragment
+def _tables_panel(tables: list) -> None:
+    st.subheader("Tables")
+    for i, t in enumerate(tables):
+        st.markdown(f"**{t.get('title') or 'Table'}**")
+        rows = t.get("rows") or []
+        if rows:
+            st.dataframe(paginate(rows, f"table_page_{i}"), use_container_width=True)
+        else:
+            st.info("No structured rows detected for this table.")
+
+
+_tables_panel(entitlements.get("tables") or [])
+
+
+@st.fragment
+def _products_panel(products: list, products_by_name: dict, doc_id: str) -> None:
+    st.subheader("Normalized Products")
+    if products:
+        display = []
+        for p in products:
+            display.append(
+                {
+                    "Product": p.get("name"),
+                    "Metric": p.get("metric"),
+                    "Quantity": p.get("quantity"),
+                    "Term": p.get("term"),
+                    "Restrictions": "; ".join(p.get("restrictions") or []),
+                }
+            )
+        st.dataframe(
+            paginate(display, "products_page"),
+            use_container_width=True,
+            column_config={
+                "Product": st.column_config.Column(width="medium"),
+                "Metric": st.column_config.Column(width="small"),
+                "Quantity": st.column_config.Column(width="small"),
+                "Term": st.column_config.Column(width="small"),
+                "Restrictions": st.column_config.Column(width="large"),
+            },
+        )
+        st.markdown("**Selected product**")
+        product_options = [p.get("name") or f"Product {idx+1}" for idx, p in enumerate(products)]
+        selected_name = st.selectbox("Select product", options=product_options)
+        selected = products_by_name[selected_name]
+        ev = (selected.get("evidence") or [{}])[0]
+        st.caption(f"p.{ev.get('page_start')}–{ev.get('page_end')}")
+        with st.expander("Feedback", expanded=False):
+            verdict = st.radio("Is this correct?", options=["Correct", "Incorrect", "Partially correct"], horizontal=True)
+            note = st.text_area("Notes (optional)", key="ent-note")
+            if st.button("Submit feedback"):
+                payload = {
+                    "item_type": "entitlements",
+                    "item_id": selected.get("name"),
+                    "verdict": verdict.lower().replace(" ", "_"),
+                    "note": note or None,
+                    "evidence": {
+                        "chunk_id": ev.get("chunk_id"),
+                        "page_start": ev.get("page_start"),
+                        "page_end": ev.get("page_end"),
+                    },
+                }
+                submit_feedback(doc_id, payload, "entitlements_feedback")
+            feedback_badge("entitlements_feedback")
     else:
-        st.info("No structured rows detected for this table.")
+        st.info("No normalized products extracted.")
+
 
-st.subheader("Normalized Products")
 products = entitlements.get("products") or []
-if products:
-    display = []
-    for p in products:
-        display.append(
-            {
-                "Product": p.get("name"),
-                "Metric": p.get("metric"),
-                "Quantity": p.get("quantity"),
-                "Term": p.get("term"),
-                "Restrictions": "; ".join(p.get("restrictions") or []),
-            }
-        )
-    st.dataframe(display, use_container_width=True)
-    st.markdown("**Selected product**")
-    product_options = [p.get("name") or f"Product {idx+1}" for idx, p in enumerate(products)]
-    selected_name = st.selectbox("Select product", options=product_options)
-    selected_idx = product_options.index(selected_name)
-    selected = products[selected_idx]
-    ev = (selected.get("evidence") or [{}])[0]
-    st.caption(f"p.{ev.get('page_start')}–{ev.get('page_end')}")
-    with st.expander("Feedback", expanded=False):
-        verdict = st.radio("Is this correct?", options=["Correct", "Incorrect", "Partially correct"], horizontal=True)
-        note = st.text_area("Notes (optional)", key="ent-note")
-        if st.button("Submit feedback"):
-            payload = {
-                "item_type": "entitlements",
-                "item_id": selected.get("name"),
-                "verdict": verdict.lower().replace(" ", "_"),
-                "note": note or None,
-                "evidence": {
-                    "chunk_id": ev.get("chunk_id"),
-                    "page_start": ev.get("page_start"),
-                    "page_end": ev.get("page_end"),
-                },
-            }
-            ok, msg = post_feedback(doc_id, payload)
-            if ok:
-                st.success("Feedback saved. Thank you.")
-            else:
-                st.error(f"Feedback failed: {msg}")
-else:
-    st.info("No normalized products extracted.")
+# Keyed like the selectbox labels; reversed so the first of any repeated name wins.
+products_by_name = {p.get("name") or f"Product {idx+1}": p for idx, p in reversed(list(enumerate(products)))}
+_products_panel(products, products_by_name, doc_id)
@@ -1,7 +1,10 @@
+import os
+
 import streamlit as st
 
 from components import select_document
-from ui_utils import fetch_document, fetch_documents, api_url
+from ui_utils import fetch_blob, fetch_document, fetch_documents, public_api_url
+from ui_constants import EXPORT_MIME_TYPES
 from ui_theme import apply_base_theme
 
 st.set_page_config(page_title="IPdf — Exports", layout="wide")
@@ -21,6 +24,14 @@ if not doc:
     st.error("Document not found")
     st.stop()
 
+def _mime(name: str) -> str:
+    return EXPORT_MIME_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+
+
+# Potentially large artifacts are opened straight from the API instead of being pulled
+# through the UI process; the rest are fetched only once their download is asked for.
+LINK_ONLY = {"document.json", "document_text.txt", "chunks.json", "extractions.json"}
+
 links = doc.get("links") or {}
 for label, key in [
     ("document.json", "document.json"),
@@ -32,5 +43,19 @@ for label, key in [
     ("review_pack.md", "review_pack.md"),
 ]:
     link = links.get(key)
-    if link:
-        st.link_button(f"Open {label}", api_url(link))
+    if not link:
+        continue
+    if key in LINK_ONLY:
+        st.link_button(f"Open {label}", public_api_url(link))
+        continue
+    prepared_key = f"export-prepared-{doc_id}-{key}"
+    if not st.session_state.get(prepared_key):
+        if not st.button(f"Prepare {label}", key=f"prep-{key}"):
+            continue
+        st.session_state[prepared_key] = True
+    # Served from a short-lived cache, so repeat downloads don't go back to the backend.
+    data = fetch_blob(link)
+    if data is not None:
+        st.download_button(f"Download {label}", data=data, file_name=label, mime=_mime(label), key=f"dl-{key}")
+    else:
+        st.link_button(f"Open {label}", public_api_url(link))
@@ -1,7 +1,6 @@
-import requests
 import streamlit as st
 
-from ui_utils import api_url, BACKEND_URL
+from ui_utils import BACKEND_URL, health
 from ui_theme import apply_base_theme
 
 
@@ -25,11 +24,11 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="section-title">Backend</div>', unsafe_allow_html=True)
     st.code(BACKEND_URL)
-    try:
-        r = requests.get(api_url("/health"), timeout=3)
-        st.success(f"API health: {r.json().get('status', 'unknown')}")
-    except Exception as e:
-        st.error(f"API not reachable: {e}")
+    ok, status = health()
+    if ok:
+        st.success(f"API health: {status}")
+    else:
+        st.error(f"API not reachable: {status}")
 
 with col2:
     st.markdown('<div class="section-title">Quick Links</div>', unsafe_allow_html=True)
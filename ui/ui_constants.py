@@ -0,0 +1,36 @@
+# Page scripts are re-executed on every rerun; constants here are built once per process.
+
+SETTLED_STATUSES = {"READY", "PARSED_LOW_CONFIDENCE", "FAILED_DOCLING", "FAILED_CHUNKING", "FAILED_INDEXING"}
+
+STATUS_MESSAGES = {
+    "AWAITING_OPTIONS": "Awaiting processing options…",
+    "QUEUED": "Queued for processing…",
+    "PARSING": "Processing PDF with Docling…",
+    "CHUNKING": "Chunking text into reviewable sections…",
+    "INDEXING": "Indexing for semantic search…",
+    "READY": "Ready for review.",
+    "PARSED_LOW_CONFIDENCE": "Parsed with fallback parser; results may be lower fidelity.",
+}
+
+STATUS_STEPS = {
+    "AWAITING_OPTIONS": 0,
+    "QUEUED": 0,
+    "PARSING": 1,
+    "CHUNKING": 2,
+    "INDEXING": 3,
+    "READY": 4,
+    "PARSED_LOW_CONFIDENCE": 4,
+}
+
+OCR_MODES = ("auto", "force", "off")
+
+TABLE_PAGE_SIZE = 100
+# Large selectboxes are slow to open and scroll; callers ask the user to filter instead.
+DEFAULT_MAX_SELECT = 50
+
+EXPORT_MIME_TYPES = {
+    ".json": "application/json",
+    ".txt": "text/plain",
+    ".csv": "text/csv",
+    ".md": "text/markdown",
+}
@@ -1,110 +1,147 @@
+from string import Template
+
 import streamlit as st
 
 
-def apply_base_theme():
-    st.markdown(
-        """
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@400;600;700&family=Source+Serif+4:wght@400;600&display=swap');
-
-        html, body, [class*="css"] {
-            font-family: 'Plus Jakarta Sans', sans-serif;
-            color: #e5e7eb;
-        }
-
-        .app-title {
-            font-size: 2.2rem;
-            font-weight: 700;
-            letter-spacing: -0.02em;
-            margin-bottom: 0.2rem;
-            color: #f9fafb;
-        }
-
-        .subtitle {
-            color: #cbd5f5;
-            font-size: 1rem;
-        }
-
-        .section-title {
-            font-size: 1.2rem;
-            font-weight: 700;
-            margin: 0.6rem 0 0.3rem 0;
-        }
-
-        .soft-card {
-            background: rgba(17, 24, 39, 0.85);
-            border: 1px solid rgba(148, 163, 184, 0.25);
-            border-radius: 14px;
-            padding: 1rem 1.2rem;
-            box-shadow: 0 12px 30px rgba(2, 6, 23, 0.45);
-        }
-
-        .pill {
-            display: inline-block;
-            padding: 0.15rem 0.6rem;
-            border-radius: 999px;
-            font-size: 0.75rem;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.04em;
-        }
-        .pill-ready { background: rgba(16, 185, 129, 0.2); color: #34d399; border: 1px solid rgba(52, 211, 153, 0.5); }
-        .pill-running { background: rgba(59, 130, 246, 0.2); color: #93c5fd; border: 1px solid rgba(147, 197, 253, 0.5); }
-        .pill-queued { background: rgba(249, 115, 22, 0.2); color: #fdba74; border: 1px solid rgba(253, 186, 116, 0.5); }
-        .pill-failed { background: rgba(239, 68, 68, 0.2); color: #fca5a5; border: 1px solid rgba(252, 165, 165, 0.5); }
-        .pill-muted { background: rgba(148, 163, 184, 0.2); color: #cbd5f5; border: 1px solid rgba(148, 163, 184, 0.45); }
-
-        .stApp {
-            background: radial-gradient(circle at top, #0f172a 0%, #0b1220 45%, #070b12 100%);
-        }
-
-        .stButton > button {
-            border-radius: 10px;
-            border: 1px solid #38bdf8;
-            background: linear-gradient(135deg, #0ea5e9, #2563eb);
-            color: #f8fafc;
-            font-weight: 600;
-            padding: 0.35rem 0.9rem;
-        }
-        .stButton > button:hover {
-            background: linear-gradient(135deg, #38bdf8, #3b82f6);
-            border-color: #7dd3fc;
-        }
-
-        .stTextInput input, .stTextArea textarea {
-            border-radius: 10px;
-            background: rgba(15, 23, 42, 0.7);
-            color: #e2e8f0;
-            border: 1px solid rgba(148, 163, 184, 0.35);
-        }
-
-        .stSelectbox div[data-baseweb="select"] {
-            border-radius: 10px;
-            background: rgba(15, 23, 42, 0.7);
-            color: #e2e8f0;
-            border: 1px solid rgba(148, 163, 184, 0.35);
-        }
-
-        .stMarkdown, .stCaption, .stText, .stAlert {
-            color: #e2e8f0;
-        }
-
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+_PALETTES = {
+    "dark": {
+        "text": "#e5e7eb",
+        "title": "#f9fafb",
+        "subtitle": "#cbd5f5",
+        "body_text": "#e2e8f0",
+        "app_bg": "radial-gradient(circle at top, #0f172a 0%, #0b1220 45%, #070b12 100%)",
+        "card_bg": "rgba(17, 24, 39, 0.85)",
+        "card_border": "rgba(148, 163, 184, 0.25)",
+        "card_shadow": "rgba(2, 6, 23, 0.45)",
+        "input_bg": "rgba(15, 23, 42, 0.7)",
+        "input_text": "#e2e8f0",
+        "input_border": "rgba(148, 163, 184, 0.35)",
+    },
+    "light": {
+        "text": "#1f2937",
+        "title": "#0f172a",
+        "subtitle": "#475569",
+        "body_text": "#1f2937",
+        "app_bg": "linear-gradient(180deg, #f8fafc 0%, #eef2f7 100%)",
+        "card_bg": "#ffffff",
+        "card_border": "rgba(15, 23, 42, 0.08)",
+        "card_shadow": "rgba(15, 23, 42, 0.08)",
+        "input_bg": "#ffffff",
+        "input_text": "#0f172a",
+        "input_border": "rgba(148, 163, 184, 0.6)",
+    },
+}
+
+# string.Template rather than str.format, so the CSS braces need no escaping.
+_CSS_TEMPLATE = Template(
+    """
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@400;600;700&family=Source+Serif+4:wght@400;600&display=swap">
+<style>
+html, body, [class*="css"] {
+    font-family: 'Plus Jakarta Sans', sans-serif;
+    color: $text;
+}
+
+.app-title {
+    font-size: 2.2rem;
+    font-weight: 700;
+    letter-spacing: -0.02em;
+    margin-bottom: 0.2rem;
+    color: $title;
+}
+
+.subtitle {
+    color: $subtitle;
+    font-size: 1rem;
+}
+
+.section-title {
+    font-size: 1.2rem;
+    font-weight: 700;
+    margin: 0.6rem 0 0.3rem 0;
+}
+
+.soft-card {
+    background: $card_bg;
+    border: 1px solid $card_border;
+    border-radius: 14px;
+    padding: 1rem 1.2rem;
+    box-shadow: 0 12px 30px $card_shadow;
+}
+
+.pill {
+    display: inline-block;
+    padding: 0.15rem 0.6rem;
+    border-radius: 999px;
+    font-size: 0.75rem;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.04em;
+}
+.pill-ready { background: rgba(16, 185, 129, 0.2); color: #34d399; border: 1px solid rgba(52, 211, 153, 0.5); }
+.pill-running { background: rgba(59, 130, 246, 0.2); color: #93c5fd; border: 1px solid rgba(147, 197, 253, 0.5); }
+.pill-queued { background: rgba(249, 115, 22, 0.2); color: #fdba74; border: 1px solid rgba(253, 186, 116, 0.5); }
+.pill-failed { background: rgba(239, 68, 68, 0.2); color: #fca5a5; border: 1px solid rgba(252, 165, 165, 0.5); }
+.pill-muted { background: rgba(148, 163, 184, 0.2); color: #cbd5f5; border: 1px solid rgba(148, 163, 184, 0.45); }
+
+.stApp {
+    background: $app_bg;
+}
+
+.stButton > button {
+    border-radius: 10px;
+    border: 1px solid #38bdf8;
+    background: linear-gradient(135deg, #0ea5e9, #2563eb);
+    color: #f8fafc;
+    font-weight: 600;
+    padding: 0.35rem 0.9rem;
+}
+.stButton > button:hover {
+    background: linear-gradient(135deg, #38bdf8, #3b82f6);
+    border-color: #7dd3fc;
+}
+
+.stTextInput input, .stTextArea textarea {
+    border-radius: 10px;
+    background: $input_bg;
+    color: $input_text;
+    border: 1px solid $input_border;
+}
+
+.stSelectbox div[data-baseweb="select"] {
+    border-radius: 10px;
+    background: $input_bg;
+    color: $input_text;
+    border: 1px solid $input_border;
+}
+
+.stMarkdown, .stCaption, .stText, .stAlert {
+    color: $body_text;
+}
+
+</style>
+"""
+)
+
+# Rendered once per palette at import; the page still has to emit it on every run,
+# because Streamlit removes any element a rerun does not re-send.
+_THEME_CSS = {variant: _CSS_TEMPLATE.substitute(palette) for variant, palette in _PALETTES.items()}
+
+
+def apply_base_theme(variant: str = "dark"):
+    st.markdown(_THEME_CSS.get(variant, _THEME_CSS["dark"]), unsafe_allow_html=True)
+
+
+_STATUS_CLASS = {
+    **{s: "pill-ready" for s in ("ready", "complete", "completed")},
+    **{s: "pill-running" for s in ("parsing", "chunking", "indexing", "running", "pending", "processing")},
+    **{s: "pill-queued" for s in ("queued", "awaiting_options")},
+    **{s: "pill-failed" for s in ("failed", "error")},
+}
 
 
 def status_pill(status: str) -> str:
-    s = (status or "").strip().lower()
-    if s in {"ready", "complete", "completed"}:
-        cls = "pill-ready"
-    elif s in {"parsing", "chunking", "indexing", "running", "pending", "processing"}:
-        cls = "pill-running"
-    elif s in {"queued", "awaiting_options"}:
-        cls = "pill-queued"
-    elif s in {"failed", "error"}:
-        cls = "pill-failed"
-    else:
-        cls = "pill-muted"
+    cls = _STATUS_CLASS.get((status or "").strip().lower(), "pill-muted")
     return f'<span class="pill {cls}">{status or "unknown"}</span>'
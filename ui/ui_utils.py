@@ -1,98 +1,384 @@
 import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _loads = json.loads
 
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+PUBLIC_BACKEND_URL = os.getenv("PUBLIC_BACKEND_URL", BACKEND_URL)
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+_SESSION = _make_session()
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ipdf-fetch")
+
+
+def _json(r: requests.Response):
+    return _loads(r.content)
 
 
 def api_url(path: str) -> str:
     return urljoin(BACKEND_URL.rstrip("/") + "/", path.lstrip("/"))
 
 
+def public_api_url(path: str) -> str:
+    return urljoin(PUBLIC_BACKEND_URL.rstrip("/") + "/", path.lstrip("/"))
+
+
+# Failures are cached too: a down backend is re-probed at most every 10s. A plain
+# request, not _SESSION, so its retries cannot stretch the 1s probe.
+@st.cache_data(ttl=10, show_spinner=False)
+def health() -> tuple[bool, str]:
+    try:
+        r = requests.get(api_url("/health"), timeout=1.0)
+        r.raise_for_status()
+        return True, _json(r).get("status", "unknown")
+    except Exception as e:
+        return False, str(e)
+
+
+_CONDITIONAL_MAX = 64
+_conditional_bodies: OrderedDict = OrderedDict()
+_conditional_lock = threading.Lock()
+
+
+def _conditional_get_json(path: str, timeout: float):
+    ok, body, _etag = _conditional_get(path, timeout)
+    return ok, body
+
+
+def _conditional_get(path: str, timeout: float):
+    # Returns (ok, body, etag); the ETag doubles as a version for derived caches.
+    url = api_url(path)
+    with _conditional_lock:
+        cached = _conditional_bodies.get(url)
+    headers = {}
+    if cached:
+        etag, last_modified, _body = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        elif last_modified:
+            headers["If-Modified-Since"] = last_modified
+    r = _SESSION.get(url, headers=headers, timeout=timeout)
+    if r.status_code == 304 and cached:
+        return True, cached[2], cached[0]
+    if not r.ok:
+        return False, None, None
+    body = _json(r)
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if etag or last_modified:
+        with _conditional_lock:
+            _conditional_bodies[url] = (etag, last_modified, body)
+            _conditional_bodies.move_to_end(url)
+            while len(_conditional_bodies) > _CONDITIONAL_MAX:
+                _conditional_bodies.popitem(last=False)
+    return True, body, etag
+
+
+# The cached loaders raise on failure: st.cache_data never memoizes an exception,
+# so a backend hiccup is retried on the next rerun instead of served for the TTL.
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_documents():
+    r = _SESSION.get(api_url("/documents"), timeout=10)
+    r.raise_for_status()
+    return _json(r)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _load_document(doc_id: str):
+    ok, body = _conditional_get_json(f"/documents/{doc_id}", timeout=10)
+    if not ok:
+        raise RuntimeError(f"document {doc_id} unavailable")
+    return body
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _load_doc_summary(doc_id: str, version: str | None):
+    r = _SESSION.get(api_url(f"/documents/{doc_id}/summary"), timeout=10)
+    r.raise_for_status()
+    return _json(r)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _load_chunks(doc_id: str):
+    r = _SESSION.get(api_url(f"/documents/{doc_id}/chunks"), timeout=10)
+    r.raise_for_status()
+    return _json(r)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _load_document_and_extractions(doc_id: str, section: str):
+    doc_future = _EXECUTOR.submit(_conditional_get_json, f"/documents/{doc_id}", 10)
+    ex_future = _EXECUTOR.submit(_conditional_get, f"/documents/{doc_id}/extractions/{section}", 20)
+    ok, doc = doc_future.result()
+    if not ok:
+        raise RuntimeError(f"document {doc_id} unavailable")
+    if "extractions.json" not in (doc.get("links") or {}):
+        return doc, None, None
+    try:
+        ok, extractions, version = ex_future.result()
+    except Exception:
+        return doc, None, None
+    return (doc, extractions, version) if ok else (doc, None, None)
+
+
+@st.cache_data(ttl=60, show_spinner=False, max_entries=32)
+def _load_blob(link: str):
+    r = _SESSION.get(api_url(link), timeout=30)
+    r.raise_for_status()
+    return r.content
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=64)
+def _load_page_image(doc_id: str, page_num: int):
+    r = _SESSION.get(api_url(f"/documents/{doc_id}/pages/{page_num}"), timeout=20)
+    r.raise_for_status()
+    return r.content
+
+
 def fetch_documents():
     try:
-        r = requests.get(api_url("/documents"), timeout=10)
-        return r.json() if r.ok else []
+        return _load_documents()
     except Exception:
         return []
 
 
 def fetch_document(doc_id: str):
-    r = requests.get(api_url(f"/documents/{doc_id}"), timeout=10)
-    if not r.ok:
+    try:
+        return _load_document(doc_id)
+    except Exception:
         return None
-    return r.json()
+
+
+def fetch_doc_summary(doc_id: str, version: str | None = None):
+    try:
+        return _load_doc_summary(doc_id, version)
+    except Exception:
+        return {}
 
 
 def fetch_chunks(doc_id: str):
     try:
-        r = requests.get(api_url(f"/documents/{doc_id}/chunks"), timeout=10)
-        return r.json() if r.ok else []
+        return _load_chunks(doc_id)
     except Exception:
         return []
 
 
-def fetch_chunks_json(link: str):
+def fetch_json_versioned(link: str):
+    try:
+        ok, body, etag = _conditional_get(link, timeout=20)
+    except Exception:
+        return None, None
+    return (body, etag) if ok else (None, None)
+
+
+def fetch_document_and_extractions(doc_id: str, section: str):
+    try:
+        return _load_document_and_extractions(doc_id, section)
+    except Exception:
+        return None, None, None
+
+
+def fetch_blob(link: str):
     try:
-        r = requests.get(api_url(link), timeout=20)
-        return r.json() if r.ok else None
+        return _load_blob(link)
     except Exception:
         return None
 
 
+def fetch_page_image(doc_id: str, page_num: int):
+    try:
+        return _load_page_image(doc_id, page_num)
+    except Exception:
+        return None
+
+
+fetch_documents.clear = _load_documents.clear
+fetch_document.clear = _load_document.clear
+fetch_doc_summary.clear = _load_doc_summary.clear
+fetch_chunks.clear = _load_chunks.clear
+fetch_document_and_extractions.clear = _load_document_and_extractions.clear
+fetch_page_image.clear = _load_page_image.clear
+fetch_blob.clear = _load_blob.clear
+
+
+def invalidate() -> None:
+    for fetch in (
+        fetch_documents,
+        fetch_document,
+        fetch_doc_summary,
+        fetch_chunks,
+        fetch_document_and_extractions,
+    ):
+        fetch.clear()
+
+
+def _finish(r: requests.Response, with_status: bool = False):
+    ok = r.ok
+    if not ok:
+        return ok, f"{r.status_code} {r.text}" if with_status else r.text
+    try:
+        return ok, _json(r)
+    except ValueError:
+        return ok, r.text
+
+
 def post_rechunk(doc_id: str):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/rechunk"), timeout=10)
-        return r.ok, r.json() if r.ok else r.text
+        r = _SESSION.post(api_url(f"/documents/{doc_id}/rechunk"), timeout=10)
+        return _finish(r)
     except Exception as e:
         return False, str(e)
 
 
 def post_reindex(doc_id: str):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/reindex"), timeout=10)
-        return r.ok, r.json() if r.ok else r.text
+        r = _SESSION.post(api_url(f"/documents/{doc_id}/reindex"), timeout=10)
+        return _finish(r)
     except Exception as e:
         return False, str(e)
 
 
-def post_process(doc_id: str, options: dict):
+def post_upload(name: str, data: bytes, content_type: str | None):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/process"), json=options, timeout=20)
-        return r.ok, r.json() if r.ok else r.text
+        files = {"file": (name, data, content_type or "application/octet-stream")}
+        r = _SESSION.post(api_url("/upload"), files=files, timeout=30)
+        return _finish(r, with_status=True)
     except Exception as e:
         return False, str(e)
 
 
-def post_rename(doc_id: str, display_name: str | None):
+def post_process(doc_id: str, options: dict):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/rename"), json={"display_name": display_name}, timeout=10)
-        return r.ok, r.json() if r.ok else r.text
+        r = _SESSION.post(api_url(f"/documents/{doc_id}/process"), json=options, timeout=20)
+        return _finish(r)
     except Exception as e:
         return False, str(e)
 
 
-def post_feedback(doc_id: str, payload: dict):
+def post_rename(doc_id: str, display_name: str | None):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/feedback"), json=payload, timeout=10)
-        return r.ok, r.json() if r.ok else r.text
+        r = _SESSION.post(api_url(f"/documents/{doc_id}/rename"), json={"display_name": display_name}, timeout=10)
+        return _finish(r)
     except Exception as e:
         return False, str(e)
 
 
+_FEEDBACK_WINDOW = 0.25
+_FEEDBACK_BATCH_MAX = 16
+_FEEDBACK_RETRIES = 3
+_FEEDBACK_STATUS_MAX = 1024
+_feedback_queue: queue.Queue = queue.Queue()
+_feedback_lock = threading.Lock()
+_feedback_worker: threading.Thread | None = None
+_feedback_states: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _set_feedback_state(sub_id: str, state: str) -> None:
+    with _feedback_lock:
+        _feedback_states[sub_id] = state
+        while len(_feedback_states) > _FEEDBACK_STATUS_MAX:
+            _feedback_states.popitem(last=False)
+
+
+def _feedback_loop() -> None:
+    while True:
+        batch = [_feedback_queue.get()]
+        deadline = time.monotonic() + _FEEDBACK_WINDOW
+        while len(batch) < _FEEDBACK_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_feedback_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        by_doc: dict[str, list[tuple]] = {}
+        for item in batch:
+            by_doc.setdefault(item[1], []).append(item)
+        for doc_id, items in by_doc.items():
+            payloads = [payload for _, _, payload, _ in items]
+            try:
+                r = _SESSION.post(api_url(f"/documents/{doc_id}/feedback:batch"), json=payloads, timeout=10)
+                ok = r.ok
+            except Exception:
+                ok = False
+            for sub_id, _, payload, attempt in items:
+                if ok:
+                    _set_feedback_state(sub_id, "sent")
+                elif attempt < _FEEDBACK_RETRIES:
+                    retry = (sub_id, doc_id, payload, attempt + 1)
+                    threading.Timer(attempt, _feedback_queue.put, args=(retry,)).start()
+                else:
+                    _set_feedback_state(sub_id, "failed")
+
+
+def enqueue_feedback(doc_id: str, payload: dict):
+    global _feedback_worker
+    with _feedback_lock:
+        if _feedback_worker is None:
+            _feedback_worker = threading.Thread(target=_feedback_loop, name="ipdf-feedback", daemon=True)
+            _feedback_worker.start()
+    sub_id = uuid.uuid4().hex
+    _set_feedback_state(sub_id, "pending")
+    _feedback_queue.put((sub_id, doc_id, payload, 1))
+    return True, sub_id
+
+
+def feedback_status(sub_ids) -> tuple[int, int]:
+    with _feedback_lock:
+        states = [_feedback_states.get(i) for i in sub_ids]
+    return states.count("pending"), states.count("failed")
+
+
 def post_extract_definitions(doc_id: str):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/extract/definitions"), timeout=20)
-        return r.ok, r.json() if r.ok else r.text
+        r = _SESSION.post(api_url(f"/documents/{doc_id}/extract/definitions"), timeout=20)
+        return _finish(r)
     except Exception as e:
         return False, str(e)
 
 
 def post_extract_entitlements(doc_id: str):
     try:
-        r = requests.post(api_url(f"/documents/{doc_id}/extract/entitlements"), timeout=20)
-        return r.ok, r.json() if r.ok else r.text
+        r = _SESSION.post(api_url(f"/documents/{doc_id}/extract/entitlements"), timeout=20)
+        return _finish(r)
+    except Exception as e:
+        return False, str(e)
+
+
+def post_search(payload: dict):
+    try:
+        r = _SESSION.post(api_url("/search"), json=payload, timeout=20)
+        return _finish(r, with_status=True)
     except Exception as e:
         return False, str(e)